@@ -0,0 +1,5 @@
+"""
+  Benchmarks for the core tgfp_lib query and scoring paths, run against synthetic data
+
+  usage: python -m benchmarks.run --help
+"""
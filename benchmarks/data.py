@@ -0,0 +1,154 @@
+"""
+  Deterministic synthetic data for the benchmarks: the same arguments always produce the
+  same documents, ids included, so timings are comparable between runs and versions
+"""
+import datetime
+import random
+from typing import Dict, List
+
+from bson import ObjectId
+
+GAMES_PER_WEEK = 16
+
+
+def _object_id(rnd: random.Random) -> ObjectId:
+    return ObjectId(rnd.getrandbits(96).to_bytes(12, 'big'))
+
+
+def _teams(rnd: random.Random) -> List[dict]:
+    return [
+        {
+            '_id': _object_id(rnd),
+            'short_name': f"T{team_no:02}",
+            'city': f"City {team_no}",
+            'long_name': f"Team {team_no}",
+            'full_name': f"City {team_no} Team {team_no}",
+            'wins': 0,
+            'losses': 0,
+            'ties': 0,
+            'tgfp_nfl_team_id': f"s:20~l:28~t:{team_no}",
+            'logo_url': '',
+            'discord_emoji': '',
+        }
+        for team_no in range(2 * GAMES_PER_WEEK)
+    ]
+
+
+def _week_games(rnd: random.Random, teams: List[dict], season: int, week_no: int,
+                final_games: int) -> List[dict]:
+    order = list(teams)
+    rnd.shuffle(order)
+    kickoff = datetime.datetime(season, 9, 7) + datetime.timedelta(weeks=week_no - 1)
+    games = []
+    for game_no in range(GAMES_PER_WEEK):
+        home, road = order[2 * game_no], order[2 * game_no + 1]
+        final = game_no < final_games
+        games.append({
+            '_id': _object_id(rnd),
+            'favorite_team_id': rnd.choice((home, road))['_id'],
+            'game_status': 'STATUS_FINAL' if final else 'STATUS_SCHEDULED',
+            'home_team_id': home['_id'],
+            'home_team_score': rnd.randint(0, 45) if final else 0,
+            'road_team_id': road['_id'],
+            'road_team_score': rnd.randint(0, 45) if final else 0,
+            'spread': rnd.choice((1.5, 2.5, 3.5, 6.5, 7.5, 10.5)),
+            'start_time': kickoff + datetime.timedelta(hours=game_no % 4 * 3),
+            'week_no': week_no,
+            'season': season,
+            'tgfp_nfl_game_id': f"nfl.g.{season}{week_no:02}{game_no:02}",
+        })
+    return games
+
+
+def _pick(rnd: random.Random, player_id: ObjectId, games: List[dict]) -> dict:
+    detail = []
+    underdogs = []
+    for game in games:
+        winner_id = rnd.choice((game['home_team_id'], game['road_team_id']))
+        detail.append({'game_id': game['_id'], 'winner_id': winner_id})
+        if winner_id != game['favorite_team_id']:
+            underdogs.append(winner_id)
+    return {
+        '_id': _object_id(rnd),
+        'lock_team_id': rnd.choice(detail)['winner_id'],
+        'player_id': player_id,
+        'upset_team_id': rnd.choice(underdogs) if underdogs else None,
+        'week_no': games[0]['week_no'],
+        'season': games[0]['season'],
+        'wins': 0,
+        'losses': 0,
+        'bonus': 0,
+        'pick_detail': detail,
+    }
+
+
+def generate(mongodb, *, seasons: int = 3, players: int = 40, weeks: int = 18,
+             clans: int = 4, seed: int = 2019) -> Dict[str, int]:
+    """
+    Replaces the contents of ``mongodb`` with ``seasons`` seasons of ``weeks`` weeks of
+    16 games each, one pick per player and week, and ``clans`` clans sharing the players.
+    The last week of the last (current) season is half played.  Picks are left unscored,
+    run ``TGFP.rescore_week`` over them to fill in wins / losses / bonus.
+
+    Return:
+        Dict[str, int]: number of documents written per collection
+    """
+    # pylint: disable=too-many-arguments,too-many-locals
+    rnd = random.Random(seed)
+    for collection in ('teams', 'players', 'games', 'picks', 'clans', 'tgfp_info', 'standings'):
+        mongodb.drop_collection(collection)
+
+    teams = _teams(rnd)
+    player_documents = [
+        {
+            '_id': _object_id(rnd),
+            'first_name': f"First{player_no}",
+            'last_name': f"Last{player_no}",
+            'nick_name': f"Nick{player_no}",
+            'email': f"player{player_no}@example.com",
+            'active': player_no % 10 != 0,
+            'discord_id': 100000 + player_no,
+        }
+        for player_no in range(players)
+    ]
+    first_season = 2023 - seasons + 1
+    current_season = first_season + seasons - 1
+    games: List[dict] = []
+    picks: List[dict] = []
+    for season in range(first_season, current_season + 1):
+        for week_no in range(1, weeks + 1):
+            in_progress = season == current_season and week_no == weeks
+            week_games = _week_games(
+                rnd, teams, season, week_no, GAMES_PER_WEEK // 2 if in_progress else GAMES_PER_WEEK
+            )
+            games.extend(week_games)
+            picks.extend(_pick(rnd, player['_id'], week_games) for player in player_documents)
+    clan_documents = [
+        {
+            '_id': _object_id(rnd),
+            'clan_name': f"Clan {clan_no}",
+            'member_ids': [
+                {'member_id': player['_id']} for player in player_documents[clan_no::clans]
+            ],
+            'captain_id': player_documents[clan_no]['_id'],
+            'discord_role_id': 900000 + clan_no,
+        }
+        for clan_no in range(min(clans, players))
+    ]
+
+    mongodb.teams.insert_many(teams)
+    mongodb.players.insert_many(player_documents)
+    mongodb.games.insert_many(games)
+    mongodb.picks.insert_many(picks)
+    if clan_documents:
+        mongodb.clans.insert_many(clan_documents)
+    mongodb.tgfp_info.insert_one(
+        {'current_season': current_season, 'home_page_text': 'benchmark data'}
+    )
+    return {
+        'teams': len(teams),
+        'players': len(player_documents),
+        'games': len(games),
+        'picks': len(picks),
+        'clans': len(clan_documents),
+    }
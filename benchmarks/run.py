@@ -0,0 +1,223 @@
+"""
+  Times the core tgfp_lib paths against synthetic data and records the results as JSON
+
+  python -m benchmarks.run                              # in-memory stand-in (needs mongomock)
+  python -m benchmarks.run --mongo-uri mongodb://localhost:27017 --replace-tgfp-db
+  python -m benchmarks.run --baseline benchmarks/results/2.7.2.json
+"""
+import argparse
+import datetime
+import json
+import platform
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from tgfp_lib import TGFP
+from tgfp_lib.tgfp import get_mongo_client
+
+from .data import generate
+
+RESULTS_DIR = Path(__file__).resolve().parent / 'results'
+
+
+def library_version() -> str:
+    """ tgfp_lib version from pyproject.toml """
+    pyproject = Path(__file__).resolve().parents[1] / 'pyproject.toml'
+    match = re.search(r'^version = "([^"]+)"', pyproject.read_text(), re.MULTILINE)
+    return match.group(1) if match else 'unknown'
+
+
+def mongo_client(mongo_uri: Optional[str], replace_tgfp_db: bool):
+    """ MongoClient for ``mongo_uri``, or a mongomock client when it's None """
+    if mongo_uri is None:
+        try:
+            # pylint: disable=import-outside-toplevel
+            import mongomock
+        except ImportError as exc:
+            raise ImportError(
+                "the in-memory benchmark backend requires mongomock, "
+                "install it or pass --mongo-uri"
+            ) from exc
+        return mongomock.MongoClient()
+    client = get_mongo_client(mongo_uri)
+    if client['tgfp'].list_collection_names() and not replace_tgfp_db:
+        raise SystemExit(
+            f"{mongo_uri} already has a tgfp database, pass --replace-tgfp-db to overwrite it"
+        )
+    return client
+
+
+def timed(function: Callable[[], object], setup: Callable[[], object], repeat: int) -> dict:
+    """ Runs ``setup`` then times ``function``, ``repeat`` times """
+    timings: List[float] = []
+    for _ in range(repeat):
+        setup()
+        start = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - start) * 1000)
+    return {
+        'runs': repeat,
+        'min_ms': round(min(timings), 3),
+        'median_ms': round(statistics.median(timings), 3),
+        'mean_ms': round(statistics.mean(timings), 3),
+    }
+
+
+def run_benchmarks(client, repeat: int) -> Dict[str, dict]:
+    """ Times every benchmark against the data already in ``client`` """
+    # pylint: disable=too-many-locals
+    def fresh() -> TGFP:
+        return TGFP('benchmark', client=client)
+
+    def warm() -> TGFP:
+        tgfp = fresh()
+        tgfp.find_games()
+        tgfp.find_picks()
+        tgfp.players()
+        tgfp.clans()
+        return tgfp
+
+    tgfp = warm()
+    season = tgfp.current_season()
+    weeks = sorted({game.week_no for game in tgfp.find_games()})
+    players = tgfp.players()
+    clans = tgfp.clans()
+    week_picks = tgfp.find_picks(week_no=weeks[0])
+
+    def cold_load():
+        loaded = fresh()
+        loaded.find_games()
+        loaded.find_picks()
+        loaded.players()
+        loaded.clans()
+
+    def find_games():
+        for week_no in weeks:
+            tgfp.find_games(week_no=week_no)
+        for game in tgfp.find_games(week_no=weeks[-1]):
+            tgfp.find_games(game_id=game.id)
+
+    def find_picks():
+        for player in players:
+            tgfp.find_picks(player_id=player.id)
+        for week_no in weeks:
+            tgfp.find_picks(week_no=week_no)
+
+    def win_csv():
+        for player in players:
+            player.win_csv()
+
+    def clan_total_points():
+        for clan in clans:
+            _ = clan.total_points
+
+    def load_record():
+        for pick in week_picks:
+            pick.load_record()
+
+    def nothing():
+        pass
+
+    def forget_weeks():
+        tgfp.invalidate_current_week()
+
+    def forget_standings():
+        tgfp.invalidate_standings(season)
+        tgfp.invalidate_clan_standings()
+
+    return {
+        'cold_load': timed(cold_load, nothing, repeat),
+        'find_games': timed(find_games, nothing, repeat),
+        'find_picks': timed(find_picks, nothing, repeat),
+        'current_week': timed(tgfp.current_week, forget_weeks, repeat),
+        'win_csv': timed(win_csv, forget_standings, repeat),
+        'clan_total_points': timed(clan_total_points, forget_standings, repeat),
+        'load_record': timed(load_record, nothing, repeat),
+    }
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], tolerance: float,
+            min_delta_ms: float) -> List[str]:
+    """
+    Benchmarks whose median got more than ``tolerance`` times and ``min_delta_ms`` slower
+    than in ``baseline``
+    """
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get(name)
+        if not before:
+            continue
+        slower_by = result['median_ms'] - before['median_ms']
+        if result['median_ms'] > before['median_ms'] * tolerance and slower_by > min_delta_ms:
+            regressions.append(
+                f"{name}: {before['median_ms']:.3f} ms -> {result['median_ms']:.3f} ms"
+            )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """ Generates the data, runs the benchmarks, writes and optionally compares the results """
+    # pylint: disable=too-many-locals
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--mongo-uri', help="local mongod to use instead of mongomock")
+    parser.add_argument('--replace-tgfp-db', action='store_true',
+                        help="allow overwriting an existing tgfp database at --mongo-uri")
+    parser.add_argument('--seasons', type=int, default=3)
+    parser.add_argument('--players', type=int, default=40)
+    parser.add_argument('--weeks', type=int, default=18)
+    parser.add_argument('--seed', type=int, default=2019)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', type=Path,
+                        help="results file (default: benchmarks/results/<version>.json)")
+    parser.add_argument('--baseline', type=Path, help="earlier results file to compare with")
+    parser.add_argument('--tolerance', type=float, default=1.25,
+                        help="slowdown factor reported as a regression")
+    parser.add_argument('--min-delta-ms', type=float, default=1.0,
+                        help="smaller slowdowns are treated as noise")
+    args = parser.parse_args(argv)
+
+    client = mongo_client(args.mongo_uri, args.replace_tgfp_db)
+    documents = generate(
+        client['tgfp'], seasons=args.seasons, players=args.players, weeks=args.weeks,
+        seed=args.seed
+    )
+    scorer = TGFP('benchmark', client=client)
+    for season in scorer.seasons:
+        for week_no in range(1, args.weeks + 1):
+            scorer.rescore_week(season, week_no)
+
+    results = run_benchmarks(client, args.repeat)
+    report = {
+        'version': library_version(),
+        'recorded_at': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'backend': 'mongod' if args.mongo_uri else 'mongomock',
+        'data': dict(documents, seed=args.seed),
+        'results': results,
+    }
+    output = args.output or RESULTS_DIR / f"{report['version']}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2) + "\n")
+    for name, result in results.items():
+        print(f"{name:<20} {result['median_ms']:>10.3f} ms")
+    print(f"results written to {output}")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        if baseline.get('data') != report['data'] or baseline.get('backend') != report['backend']:
+            print("warning: baseline was recorded with different data or backend")
+        regressions = compare(
+            results, baseline['results'], args.tolerance, args.min_delta_ms
+        )
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
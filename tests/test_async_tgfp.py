@@ -0,0 +1,78 @@
+"""Unit Test for AsyncTGFP """
+import asyncio
+
+from bson import ObjectId
+
+from config import get_config, Config
+
+from tgfp_lib import TGFP
+from tgfp_lib.async_tgfp import AsyncTGFP
+
+config: Config = get_config()
+
+
+# pylint: disable=missing-function-docstring
+def test_aload():
+    async def load() -> AsyncTGFP:
+        tgfp = AsyncTGFP(config.MONGO_URI)
+        await tgfp.aload(season=2019)
+        return tgfp
+
+    tgfp = asyncio.run(load())
+    # pylint: disable=protected-access
+    assert list(tgfp._games) == [2019]
+    assert len(tgfp.find_games(season=2019)) == 267
+    assert len(tgfp.find_picks(season=2019)) == 441
+    assert len(tgfp.teams()) == 32
+
+
+def test_afind():
+    async def find(tgfp: AsyncTGFP):
+        return await asyncio.gather(
+            tgfp.afind_games(season=2019, week_no=15),
+            tgfp.afind_picks(season=2019, week_no=1),
+            tgfp.afind_picks(season=2019, player_id=ObjectId('59a97660ee45e20848e119aa'))
+        )
+
+    for query_mode in (False, True):
+        games, week_one_picks, player_picks = asyncio.run(
+            find(AsyncTGFP(config.MONGO_URI, query_mode=query_mode))
+        )
+        assert len(games) == 16
+        assert len(week_one_picks) == 22
+        assert len(player_picks) == 21
+
+
+def test_shared_motor_client():
+    async def clients():
+        return AsyncTGFP(config.MONGO_URI).motorclient, AsyncTGFP(config.MONGO_URI).motorclient
+
+    first, second = asyncio.run(clients())
+    assert first is second
+    # a new loop gets its own client, motor clients are bound to their loop
+    assert asyncio.run(clients())[0] is not first
+
+
+def test_acurrent_week():
+    async def current_weeks(tgfp: AsyncTGFP):
+        return await tgfp.acurrent_week(), await tgfp.acurrent_active_week()
+
+    tgfp = TGFP(config.MONGO_URI)
+    assert asyncio.run(current_weeks(AsyncTGFP(config.MONGO_URI))) == \
+           (tgfp.current_week(), tgfp.current_active_week())
+
+
+def test_sync_save_rescores():
+    # a game saved with save() on an AsyncTGFP is rescored right away, not deferred
+    tgfp = AsyncTGFP(config.MONGO_URI)
+    game = tgfp.find_games(season=2022)[0]
+    rescored = []
+    tgfp.subscribe(lambda changed_game, picks: rescored.append(changed_game))
+    game.home_team_score, game.road_team_score = game.road_team_score, game.home_team_score
+    game.save()
+    try:
+        assert rescored == [game]
+        assert TGFP(config.MONGO_URI).rescore_week(game.season, game.week_no) == 0
+    finally:
+        game.home_team_score, game.road_team_score = game.road_team_score, game.home_team_score
+        game.save()
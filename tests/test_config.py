@@ -0,0 +1,84 @@
+"""Unit Test For Config """
+import os
+
+import pytest
+
+from config import Config, LocalHelper, SettingsCache
+
+LOCAL_VALUES = {setting.name: f"value of {setting.name}" for setting in Config.settings()}
+
+
+class CountingHelper(LocalHelper):
+    """ LocalHelper that records what was fetched """
+    def __init__(self, environment: str):
+        super().__init__(environment, LOCAL_VALUES)
+        self.fetched = []
+
+    def get_secret(self, secret_name: str) -> str:
+        """ Records and returns the secret """
+        self.fetched.append(secret_name)
+        return super().get_secret(secret_name)
+
+    def get_variable(self, variable_name: str) -> str:
+        """ Records and returns the variable """
+        self.fetched.append(variable_name)
+        return super().get_variable(variable_name)
+
+
+# pylint: disable=missing-function-docstring
+def test_lazy_resolution():
+    helper = CountingHelper('test')
+    config = Config(environment='test', helper=helper)
+    assert not helper.fetched
+    assert config.MONGO_URI == "value of mongo-uri"
+    assert config.MONGO_URI == "value of mongo-uri"
+    assert helper.fetched == ['mongo-uri']
+    config.warm()
+    assert len(helper.fetched) == len(Config.settings())
+    assert config.LISTMONK_API_URL == "value of listmonk_api_url"
+    assert os.environ['OAUTHLIB_INSECURE_TRANSPORT'] == \
+        "value of discord_oauthlib_insecure_transport"
+    assert len(helper.fetched) == len(Config.settings())
+
+
+def test_local_config_file(tmp_path, monkeypatch):
+    config_file = tmp_path / 'config.json'
+    config_file.write_text('{"mongo-uri": "mongodb://localhost"}')
+    monkeypatch.setenv('TGFP_LOCAL_CONFIG', str(config_file))
+    monkeypatch.delenv('TGFP_CONFIG_CACHE', raising=False)
+    assert Config(environment='test').MONGO_URI == "mongodb://localhost"
+
+
+def test_settings_cache(tmp_path):
+    pytest.importorskip('cryptography')
+    cache_file = tmp_path / 'config.cache'
+    cache_path = str(cache_file)
+    cache = SettingsCache(cache_path, 'passphrase', 'test')
+    config = Config(environment='test', helper=CountingHelper('test'), cache=cache)
+    config.warm()
+    assert 'mongo-uri' not in cache_file.read_text()
+
+    helper = CountingHelper('test')
+    cached_config = Config(environment='test', helper=helper, cache=cache)
+    assert cached_config.SECRET_KEY == "value of web-secret-key"
+    assert not helper.fetched
+    assert not SettingsCache(cache_path, 'wrong passphrase', 'test').load()
+    assert not SettingsCache(cache_path, 'passphrase', 'production').load()
+    assert not SettingsCache(cache_path, 'passphrase', 'test', ttl=-10).load()
+
+
+def test_class_access(tmp_path, monkeypatch):
+    # pylint: disable=import-outside-toplevel
+    from config.config import _shared_config
+
+    config_file = tmp_path / 'config.json'
+    config_file.write_text('{"mongo-uri": "mongodb://shared"}')
+    monkeypatch.setenv('TGFP_LOCAL_CONFIG', str(config_file))
+    monkeypatch.setenv('ENVIRONMENT', 'test')
+    monkeypatch.delenv('TGFP_CONFIG_CACHE', raising=False)
+    _shared_config.cache_clear()
+    try:
+        assert Config.MONGO_URI == "mongodb://shared"
+        assert hasattr(Config, 'ENVIRONMENT')
+    finally:
+        _shared_config.cache_clear()
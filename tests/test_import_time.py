@@ -0,0 +1,46 @@
+"""Import time budget for tgfp_lib """
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+# cumulative microseconds `python -X importtime` may report for the hot import path
+IMPORT_BUDGET_US = 500_000
+# dependencies only the features that need them may import
+DEFERRED_MODULES = ('prefect', 'pytz', 'numpy', 'motor', 'pprint', 'pymongo', 'cryptography')
+
+
+def _import(statement: str) -> subprocess.CompletedProcess:
+    environment = dict(os.environ, PYTHONPATH=f"{REPO_ROOT}{os.pathsep}{REPO_ROOT / 'tgfp_lib'}")
+    check = f"{statement}; import sys; print(' '.join(sys.modules))"
+    return subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', check],
+        env=environment,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+
+
+def _cumulative_us(importtime_output: str, module: str) -> int:
+    for line in importtime_output.splitlines():
+        fields = [field.strip() for field in line.split('|')]
+        if len(fields) == 3 and fields[2] == module:
+            return int(fields[1])
+    raise AssertionError(f"{module} missing from the -X importtime output")
+
+
+# pylint: disable=missing-function-docstring
+def test_tgfp_lib_import():
+    result = _import('import tgfp_lib')
+    loaded = {name.split('.')[0] for name in result.stdout.split()}
+    assert not loaded.intersection(DEFERRED_MODULES)
+    assert _cumulative_us(result.stderr, 'tgfp_lib') < IMPORT_BUDGET_US
+
+
+def test_config_import():
+    result = _import('import config')
+    loaded = {name.split('.')[0] for name in result.stdout.split()}
+    assert not loaded.intersection(DEFERRED_MODULES)
+    assert _cumulative_us(result.stderr, 'config') < IMPORT_BUDGET_US
@@ -1,5 +1,6 @@
 """Unit Test For TGFP """
 import os
+import threading
 from typing import List
 
 import pytest
@@ -43,7 +44,7 @@ def tgfp_db_reg_season(tgfp_db: TGFP):
             new_games.append(game)
     # pylint: disable=protected-access
     # ^^^ I know what I'm doing here.
-    tgfp_db._games = new_games
+    tgfp_db._games[2019] = new_games
     return tgfp_db
 
 
@@ -91,7 +92,7 @@ def tgfp_db_reg_season_c(tgfp_db_reg_season):
     'pregame'
     :rtype: TGFP
     """
-    for game in tgfp_db_reg_season.games():
+    for game in tgfp_db_reg_season.games(season=2019):
         if game.week_no == 17:
             game.game_status = 'pregame'
 
@@ -111,7 +112,7 @@ def tgfp_db_reg_season_d(tgfp_db_reg_season):
     'in progress'
     :rtype: TGFP
     """
-    for game in tgfp_db_reg_season.games():
+    for game in tgfp_db_reg_season.games(season=2019):
         if game.week_no == 17:
             game.game_status = 'in progress'
 
@@ -155,8 +156,9 @@ def test_players(tgfp_db):
 
 
 def test_current_week_last_week(tgfp_db_reg_season):
-    # count the new games array to make sure we've got a good set of data
-    assert len(tgfp_db_reg_season.games()) == (267 - 11)  # all playoff games plus last week
+    # count the new games array to make sure we've got a good set of data,
+    # all but the playoff games and the last week's
+    assert len(tgfp_db_reg_season.games(season=2019)) == (267 - 11)
     assert tgfp_db_reg_season.current_week() == 17  # should be the last completed week + 1
     assert tgfp_db_reg_season.current_active_week() == 16
 
@@ -276,7 +278,169 @@ def test_find_games(tgfp_db):
     assert found_games[0].tgfp_nfl_game_id == 'nfl.g.20190905003'
 
 
+def test_index_lookups_match_scan(tgfp_db):
+    # each indexed find_* path returns what filtering the unfiltered list returns
+    games = tgfp_db.games(2019)
+    for game in games:
+        assert tgfp_db.find_games(game_id=game.id) == [game]
+        assert tgfp_db.find_games(tgfp_nfl_game_id=game.tgfp_nfl_game_id) == [
+            other for other in games if other.tgfp_nfl_game_id == game.tgfp_nfl_game_id
+        ]
+    for week_no in {game.week_no for game in games}:
+        assert tgfp_db.find_games(week_no=week_no) == [
+            game for game in games if game.week_no == week_no
+        ]
+    picks = tgfp_db.picks(2019)
+    for pick in picks:
+        assert tgfp_db.find_picks(pick_id=pick.id) == [pick]
+    for player_id in {pick.player_id for pick in picks}:
+        assert tgfp_db.find_picks(player_id=player_id) == [
+            pick for pick in picks if pick.player_id == player_id
+        ]
+    for week_no in {pick.week_no for pick in picks}:
+        assert tgfp_db.find_picks(week_no=week_no) == [
+            pick for pick in picks if pick.week_no == week_no
+        ]
+    players = tgfp_db.players()
+    for player in players:
+        assert tgfp_db.find_players(player_id=player.id) == [player]
+        assert tgfp_db.find_players(player_email=player.email) == [
+            other for other in players if other.email == player.email
+        ]
+        assert tgfp_db.find_players(discord_id=player.discord_id) == [
+            other for other in players if other.discord_id == player.discord_id
+        ]
+    teams = tgfp_db.teams()
+    for team in teams:
+        assert tgfp_db.find_teams(team_id=team.id) == [team]
+        assert tgfp_db.find_teams(tgfp_nfl_team_id=team.tgfp_nfl_team_id) == [
+            other for other in teams if other.tgfp_nfl_team_id == team.tgfp_nfl_team_id
+        ]
+
+
+def test_index_after_key_change(tgfp_db):
+    # saving a key field drops the indexes over the collection, lookups see the new value
+    game: TGFPGame = tgfp_db.find_games(week_no=1)[0]
+    pick: TGFPPick = tgfp_db.find_picks(week_no=1)[0]
+    player: TGFPPlayer = tgfp_db.find_players()[0]
+    team: TGFPTeam = tgfp_db.find_teams()[0]
+    original = (game.week_no, pick.lock_team_id, player.email, team.tgfp_nfl_team_id)
+    # build the indexes before the change
+    assert game in tgfp_db.find_games(week_no=original[0])
+    assert pick in tgfp_db.find_picks(week_no=1)
+    assert tgfp_db.find_players(player_email=original[2]) == [player]
+    assert tgfp_db.find_teams(tgfp_nfl_team_id=original[3]) == [team]
+    game.week_no = 99
+    pick.lock_team_id = team.id
+    player.email = 'index.test@example.com'
+    team.tgfp_nfl_team_id = 'index_test'
+    for model in (game, pick, player, team):
+        model.save()
+    try:
+        assert tgfp_db.find_games(week_no=99) == [game]
+        assert game not in tgfp_db.find_games(week_no=original[0])
+        assert tgfp_db.find_picks(week_no=1) == [
+            other for other in tgfp_db.picks(2019) if other.week_no == 1
+        ]
+        assert tgfp_db.find_picks(pick_id=pick.id) == [pick]
+        assert tgfp_db.find_players(player_email='index.test@example.com') == [player]
+        assert not tgfp_db.find_players(player_email=original[2])
+        assert tgfp_db.find_teams(tgfp_nfl_team_id='index_test') == [team]
+        assert not tgfp_db.find_teams(tgfp_nfl_team_id=original[3])
+    finally:
+        (game.week_no, pick.lock_team_id, player.email, team.tgfp_nfl_team_id) = original
+        for model in (game, pick, player, team):
+            model.save()
+
 def test_seasons(tgfp_db):
     seasons: List[int] = tgfp_db.seasons
     assert seasons[0] == 2018
     assert tgfp_db.current_season() == seasons[1]
+
+
+def test_find_query_mode(mocker):
+    mocker.patch("tgfp.TGFP.current_season", return_value=2019)
+    tgfp_query = TGFP(config.MONGO_URI, query_mode=True)
+    assert len(tgfp_query.find_games()) == 267
+    assert len(tgfp_query.find_games(season=2019, week_no=15)) == 16
+    found_games = tgfp_query.find_games(tgfp_nfl_game_id='nfl.g.20190908020')
+    assert found_games[0].home_team_score == 16
+    assert len(tgfp_query.find_picks(week_no=1)) == 22
+    assert len(tgfp_query.find_picks(player_id=ObjectId('59a97660ee45e20848e119aa'))) == 21
+    # nothing should have been loaded into the full caches
+    # pylint: disable=protected-access
+    assert not tgfp_query._games
+    assert not tgfp_query._picks
+
+
+def test_season_partitions(tgfp_db):
+    # pylint: disable=protected-access
+    assert len(tgfp_db.find_games()) == 267
+    assert list(tgfp_db._games) == [2019]
+    assert len(tgfp_db.find_picks(season=2020)) == 420
+    assert sorted(tgfp_db._picks) == [2020]
+    assert len(tgfp_db.games()) == sum(
+        len(tgfp_db.find_games(season=season)) for season in tgfp_db.seasons
+    )
+
+
+def test_shared_client_and_view(tgfp_db):
+    # pylint: disable=protected-access
+    assert TGFP(config.MONGO_URI).mongoclient is tgfp_db.mongoclient
+    request_view = tgfp_db.view()
+    assert request_view.mongoclient is tgfp_db.mongoclient
+    assert len(request_view.find_games()) == 267
+    assert tgfp_db._games is request_view._games
+    assert list(tgfp_db._games) == [2019]
+    with request_view.unit_of_work() as unit_of_work:
+        # saves of objects the base instance loaded join the view's unit of work
+        assert tgfp_db._current_unit_of_work() is unit_of_work
+        other_thread = []
+        thread = threading.Thread(
+            target=lambda: other_thread.append(tgfp_db.view()._current_unit_of_work())
+        )
+        thread.start()
+        thread.join()
+        assert other_thread == [None]
+    assert tgfp_db._current_unit_of_work() is None
+
+
+def test_views_load_once(tgfp_db):
+    # views on request threads share the caches, concurrent cold loads must not double up
+    barrier = threading.Barrier(4)
+    loaded = []
+
+    def load():
+        request_view = tgfp_db.view()
+        barrier.wait()
+        loaded.append((request_view.picks(), request_view.find_games(week_no=1)))
+
+    threads = [threading.Thread(target=load) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    expected = TGFP(config.MONGO_URI)
+    for picks, week_one_games in loaded:
+        assert len(picks) == len({pick.id for pick in picks}) == len(expected.picks())
+        assert len(week_one_games) == len(expected.find_games(week_no=1))
+
+
+def test_current_week_cached(tgfp_db_reg_season_c):
+    assert tgfp_db_reg_season_c.current_week() == 17
+    for game in tgfp_db_reg_season_c.find_games(week_no=17):
+        game.game_status = 'STATUS_FINAL'
+    # unsaved status changes don't touch the cached value
+    assert tgfp_db_reg_season_c.current_week() == 17
+    tgfp_db_reg_season_c.invalidate_current_week()
+    assert tgfp_db_reg_season_c.current_week() == 18
+    assert tgfp_db_reg_season_c.current_active_week() == 17
+
+
+def test_ensure_indexes(tgfp_db):
+    names = tgfp_db.ensure_indexes()
+    assert 'tgfp_nfl_game_id_1' in names['games']
+    assert 'player_id_1_week_no_1_season_1' in names['picks']
+    # a second run finds them all in place
+    assert tgfp_db.ensure_indexes() == names
+    assert not tgfp_db.diagnose_query_plans()
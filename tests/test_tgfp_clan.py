@@ -1,4 +1,6 @@
 """ Test module for testing clans """
+from bson import ObjectId
+
 from tgfp import TGFP, TGFPClan, TGFPPlayer
 from config import get_config, Config
 
@@ -45,3 +47,52 @@ def test_delete_member():
     assert player_2 is None
     johns_clan.delete_all_members()
     assert len(johns_clan.members) == 0
+
+
+def test_clan_standings():
+    """ Test the clan leaderboard against the members' own standings """
+    tgfp = TGFP(config.MONGO_URI)
+    rows = tgfp.clan_standings()
+    assert len(rows) == len(tgfp.clans())
+    assert [row.total_points for row in rows] == sorted(
+        (row.total_points for row in rows), reverse=True
+    )
+    for row in rows:
+        assert row.members is row.clan.members
+        assert row.wins == sum(member.wins() for member in row.members)
+        assert row.last_bonus == sum(member.last_bonus() for member in row.members)
+        assert row.clan.total_points == row.total_points
+    ordered = tgfp.clans(ordered_by="total_points", reverse_order=True)
+    assert [clan.total_points for clan in ordered] == [row.total_points for row in rows]
+
+
+def test_create_clan():
+    """ A clan built with an _id is written by its first save """
+    tgfp = TGFP(config.MONGO_URI)
+    captain: TGFPPlayer = tgfp.players()[0]
+    clan_id = ObjectId()
+    new_clan = TGFPClan(tgfp, data={
+        '_id': clan_id,
+        'clan_name': 'New Clan',
+        'member_ids': [{'member_id': captain.id}],
+        'captain_id': captain.id,
+        'discord_role_id': 1
+    })
+    new_clan.save()
+    try:
+        assert tgfp.find_clan(clan_id=clan_id) is new_clan
+        stored: TGFPClan = TGFP(config.MONGO_URI).find_clan(clan_id=clan_id)
+        assert stored.member_ids == [{'member_id': captain.id}]
+    finally:
+        tgfp.mongodb.clans.delete_one({'_id': clan_id})
+
+
+def test_member_ids_changed_in_place():
+    """ Appending to member_ids is a change save() writes, no mark_dirty needed """
+    tgfp = TGFP(config.MONGO_URI)
+    johns_clan: TGFPClan = tgfp.find_clan(clan_name="Team John")
+    assert not johns_clan.changed_data()
+    johns_clan.member_ids.append({'member_id': tgfp.players()[0].id})
+    assert 'member_ids' in johns_clan.changed_data()
+    johns_clan.member_ids.pop()
+    assert not johns_clan.changed_data()
@@ -56,6 +56,23 @@ def test_game_save(game: TGFPGame):
     newer_game.save()
 
 
+def test_final_game_rescores_picks(tgfp_db: TGFP, game: TGFPGame):
+    rescored = []
+    tgfp_db.subscribe(lambda changed_game, picks: rescored.append((changed_game, picks)))
+    game.home_team_score, game.road_team_score = game.road_team_score, game.home_team_score
+    game.save()
+    try:
+        assert rescored and rescored[0][0] is game
+        for pick in rescored[0][1]:
+            assert game.id in pick.pick_detail.game_ids or pick.lock_team_id in (
+                game.home_team_id, game.road_team_id)
+        # only the referencing picks needed it, a full pass finds nothing left to do
+        assert TGFP(config.MONGO_URI).rescore_week(game.season, game.week_no) == 0
+    finally:
+        game.home_team_score, game.road_team_score = game.road_team_score, game.home_team_score
+        game.save()
+
+
 # noinspection DuplicatedCode
 def test_winner_id_of_game(game: TGFPGame):
     home_team_id = game.home_team_id
@@ -0,0 +1,56 @@
+"""Unit Test for the TGFP instrumentation """
+import pytest
+
+from tgfp import TGFP
+from config import get_config, Config
+
+from tgfp_lib.metrics import TGFPMetrics
+
+config: Config = get_config()
+
+
+# pylint: disable=redefined-outer-name
+@pytest.fixture
+def metrics() -> TGFPMetrics:
+    """
+    Fresh metrics collector
+    """
+    return TGFPMetrics()
+
+
+@pytest.fixture
+def tgfp_db(mocker, metrics: TGFPMetrics) -> TGFP:
+    """
+    This will return the default tgfp database object with metrics enabled
+
+    :return: tgfp database object
+    :rtype: TGFP
+    """
+    mocker.patch("tgfp.TGFP.current_season", return_value=2019)
+    return TGFP(config.MONGO_URI, metrics=metrics)
+
+
+# pylint: disable=missing-function-docstring
+def test_query_count(tgfp_db: TGFP, metrics: TGFPMetrics):
+    with metrics.count_queries() as queries:
+        tgfp_db.find_games()
+    assert queries.count == 1
+    assert queries.commands[0][1] == 'games'
+    with metrics.count_queries() as queries:
+        tgfp_db.find_games(week_no=1)
+        tgfp_db.find_games(week_no=2)
+    assert queries.count == 0
+
+
+def test_snapshot(tgfp_db: TGFP, metrics: TGFPMetrics):
+    tgfp_db.find_games()
+    tgfp_db.find_games(week_no=3)
+    tgfp_db.find_picks(week_no=3)
+    snapshot = metrics.snapshot()
+    assert snapshot['calls']['find_games']['count'] == 2
+    assert snapshot['calls']['load_games']['count'] == 1
+    assert snapshot['calls']['load_picks']['count'] == 1
+    assert snapshot['commands']['find']['count'] >= 2
+    text = metrics.prometheus_text()
+    assert 'tgfp_call_duration_seconds_count{method="find_games"} 2' in text
+    assert '# TYPE tgfp_mongo_command_duration_seconds histogram' in text
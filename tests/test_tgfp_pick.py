@@ -73,3 +73,116 @@ def test_load_record(pick):
 
 def test_games(pick):
     assert len(pick.games) > 15
+
+
+def test_rescore_week(tgfp_db: TGFP, pick: TGFPPick):
+    tgfp_db.rescore_week(pick.season, pick.week_no)
+    assert pick.wins == 8
+    # every record is current now, so nothing is left to write
+    assert tgfp_db.rescore_week(pick.season, pick.week_no) == 0
+    new_pick: TGFPPick = TGFP(config.MONGO_URI).find_picks(pick_id=pick.id)[0]
+    assert new_pick.wins == pick.wins
+
+
+def test_materialized_standings(mocker):
+    mocker.patch("tgfp.TGFP.current_season", return_value=2022)
+    tgfp_db = TGFP(config.MONGO_URI, materialized_standings=True)
+    assert not tgfp_db.rebuild_standings_collection()
+    ranked = tgfp_db.find_players(ordered_by="total_points", reverse_order=True)
+    assert ranked[0].total_points() == max(player.total_points() for player in ranked)
+    pick: TGFPPick = tgfp_db.find_picks()[0]
+    pick.wins += 1
+    pick.save()
+    assert not tgfp_db.verify_standings_collection()
+    assert tgfp_db.rescore_week(pick.season, pick.week_no) == 1
+    assert not tgfp_db.verify_standings_collection()
+
+
+def test_materialized_standings_resubmitted_pick(mocker):
+    mocker.patch("tgfp.TGFP.current_season", return_value=2022)
+    tgfp_db = TGFP(config.MONGO_URI, materialized_standings=True)
+    assert not tgfp_db.rebuild_standings_collection()
+    pick: TGFPPick = tgfp_db.find_picks()[0]
+    # a fresh object for a week the player already picked overwrites the stored pick
+    resubmitted = TGFPPick(tgfp_db, data=pick.mongo_data())
+    resubmitted.save()
+    assert resubmitted.id == pick.id
+    assert not tgfp_db.verify_standings_collection()
+    with tgfp_db.unit_of_work():
+        TGFPPick(tgfp_db, data=pick.mongo_data()).save()
+    assert not tgfp_db.verify_standings_collection()
+
+
+def test_pick_detail(pick: TGFPPick):
+    assert not hasattr(pick, '__dict__')
+    detail = pick.mongo_data()['pick_detail']
+    assert isinstance(detail, list)
+    assert pick.pick_detail == detail
+    assert pick.pick_detail[0] == {'game_id': detail[0]['game_id'],
+                                   'winner_id': detail[0]['winner_id']}
+    assert not pick.changed_data()
+    pick.pick_detail[0] = detail[0]
+    assert 'pick_detail' in pick.changed_data()
+
+
+def test_new_pick_is_cached(tgfp_db: TGFP, pick: TGFPPick):
+    new_pick = TGFPPick(tgfp_db, data=None)
+    new_pick.player_id = pick.player_id
+    new_pick.week_no = 99
+    new_pick.lock_team_id = pick.lock_team_id
+    new_pick.pick_detail = []
+    new_pick.save()
+    try:
+        assert new_pick.id is not None
+        assert tgfp_db.find_picks(week_no=99) == [new_pick]
+        assert tgfp_db.find_picks(pick_id=new_pick.id)[0] is new_pick
+        assert tgfp_db.find_picks(pick_id=pick.id)[0] is pick
+    finally:
+        tgfp_db.mongodb.picks.delete_one({'_id': new_pick.id})
+
+
+def test_new_season_pick_is_cached(tgfp_db: TGFP, pick: TGFPPick):
+    # every season is loaded, the new season gets its partition with the first pick
+    all_picks = len(tgfp_db.picks())
+    new_pick = TGFPPick(tgfp_db, data=None)
+    new_pick.player_id = pick.player_id
+    new_pick.week_no = 1
+    new_pick.season = 2099
+    new_pick.lock_team_id = pick.lock_team_id
+    new_pick.pick_detail = []
+    new_pick.save()
+    try:
+        assert tgfp_db.picks(2099) == [new_pick]
+        assert len(tgfp_db.picks()) == all_picks + 1
+    finally:
+        tgfp_db.mongodb.picks.delete_one({'_id': new_pick.id})
+
+
+def test_pick_moved_to_new_week(tgfp_db: TGFP, pick: TGFPPick):
+    # saves upsert on player / week / season, a pick moved to a new week is written whole
+    week_no = pick.week_no
+    moved = {'player_id': pick.player_id, 'week_no': 99, 'season': pick.season}
+    pick.week_no = 99
+    pick.save()
+    try:
+        stored = tgfp_db.mongodb.picks.find_one(moved)
+        assert stored['lock_team_id'] == pick.lock_team_id
+        assert stored['pick_detail'] == pick.pick_detail.mongo_data()
+    finally:
+        tgfp_db.mongodb.picks.delete_one(moved)
+        pick.week_no = week_no
+
+def test_iter_picks(tgfp_db: TGFP):
+    # pylint: disable=protected-access
+    streamed = [pick.id for pick in tgfp_db.iter_picks(season=2022, week_no=1, batch_size=10)]
+    assert not tgfp_db._picks
+    assert not tgfp_db._interned_ids
+    assert sorted(streamed) == sorted(pick.id for pick in tgfp_db.find_picks(week_no=1))
+    partial: TGFPPick = next(tgfp_db.iter_picks(season=2022, projection=['wins', 'bonus']))
+    assert hasattr(partial, 'wins')
+    assert not hasattr(partial, 'pick_detail')
+    weeks = [
+        game.week_no
+        for game in tgfp_db.iter_games(season=2022, projection=['week_no'], ordered=True)
+    ]
+    assert weeks == sorted(weeks)
@@ -1,6 +1,7 @@
 """Unit Test wrapper for discord_bot_tester.py"""
 import math
 from unittest.mock import MagicMock
+from bson import ObjectId
 import pytest
 from tgfp import TGFP, TGFPPick, TGFPPlayer, TGFPTeam
 from config import get_config, Config
@@ -142,7 +143,83 @@ def test_player_save(player: TGFPPlayer):
     new_player.save()
 
 
-def test_player_pick_history(player: TGFPPlayer):
+def test_player_pick_history(tgfp_db: TGFP, player: TGFPPlayer):
     assert len(player.pick_history()) > 30
     assert isinstance(player.pick_history()[0], TGFPPick)
-
+    history = player.pick_history()
+    assert history == sorted(history, key=lambda pick: (pick.season, pick.week_no))
+    assert all(pick.player_id == player.id for pick in history)
+    assert len(history) == sum(
+        len(tgfp_db.find_picks(season=season, player_id=player.id))
+        for season in tgfp_db.seasons
+    )
+
+
+
+def test_player_standings(tgfp_db: TGFP, player: TGFPPlayer):
+    standings = tgfp_db.standings()
+    assert standings.season == 2019
+    assert player.id in standings.player_ids
+    assert standings.through_week(player.id, 'wins') == 166
+    assert standings.for_week(player.id, 'losses', 2) == 6
+    assert standings.through_week(player.id, 'points', 2) == \
+           player.wins(week_through=2) + player.bonus(week_through=2)
+    assert standings.through_week(player.id, 'points') == player.total_points()
+
+
+def test_aggregate_standings(tgfp_db: TGFP, player: TGFPPlayer):
+    rows = tgfp_db.aggregate_standings()
+    assert len(rows) == len(tgfp_db.standings().player_ids)
+    assert rows[0]['total_points'] >= rows[-1]['total_points']
+    row = next(row for row in rows if row['player_id'] == player.id)
+    assert row['nick_name'] == player.nick_name
+    assert row['total_points'] == player.total_points()
+    assert row['last_wins'] == player.last_wins()
+    assert row['last_bonus'] == player.last_bonus()
+    week_rows = tgfp_db.aggregate_standings(by_week=True)
+    week_row = next(
+        row for row in week_rows if row['player_id'] == player.id and row['week_no'] == 2
+    )
+    assert week_row['losses'] == player.losses(week_no=2)
+
+
+def test_standings_matrix(tgfp_db: TGFP, player: TGFPPlayer):
+    pytest.importorskip('numpy')
+    matrix = tgfp_db.standings_matrix()
+    row = matrix.row(player.id)
+    assert matrix.wins.shape == (len(matrix.player_ids), matrix.last_week_no)
+    assert matrix.wins[row].sum() == player.wins()
+    assert matrix.losses[row][1] == player.losses(week_no=2)
+    assert matrix.cumulative()[row][5] == player.wins(week_through=6) + player.bonus(week_through=6)
+    assert math.isclose(matrix.winning_pct()[row], player.winning_pct(), abs_tol=0.00001)
+    leader = tgfp_db.find_players(ordered_by='total_points', reverse_order=True)[0]
+    assert matrix.rank()[matrix.row(leader.id)] == 1
+
+
+def test_player_changed_data(player: TGFPPlayer):
+    assert not player.changed_data()
+    player.first_name = "Juan"
+    assert player.changed_data() == {'first_name': "Juan"}
+    player.first_name = "John"
+    assert not player.changed_data()
+
+
+def test_create_player(tgfp_db: TGFP):
+    player_id = ObjectId()
+    new_player = TGFPPlayer(tgfp_db, data={
+        '_id': player_id,
+        'last_name': 'Player',
+        'first_name': 'New',
+        'nick_name': 'Newbie',
+        'email': 'new.player@example.com',
+        'active': True,
+        'discord_id': 1
+    })
+    # built from the caller's data, so the first save writes the whole player
+    assert new_player.changed_data()
+    new_player.save()
+    try:
+        assert tgfp_db.find_players(player_id=player_id) == [new_player]
+        assert TGFP(config.MONGO_URI).find_players(player_id=player_id)[0].nick_name == 'Newbie'
+    finally:
+        tgfp_db.mongodb.players.delete_one({'_id': player_id})
@@ -42,3 +42,40 @@ def test_find_by_name(tgfp_db):
     assert len(teams) == 1
     team: TGFPTeam = teams[0]
     assert isinstance(team, TGFPTeam)
+
+
+def test_unit_of_work(tgfp_db):
+    teams: List[TGFPTeam] = tgfp_db.teams()
+    bills: TGFPTeam = tgfp_db.find_teams(long_name='Bills')[0]
+    with tgfp_db.unit_of_work(ordered=False) as unit_of_work:
+        for team in teams:
+            team.save()
+        # unchanged teams aren't written at all
+        assert len(unit_of_work) == 0
+        bills.wins += 1
+        bills.save()
+        bills.save()
+        assert len(unit_of_work) == 1
+    assert len(unit_of_work) == 0
+    saved_bills: TGFPTeam = TGFP(config.MONGO_URI).find_teams(long_name='Bills')[0]
+    assert saved_bills.wins == bills.wins
+    bills.wins -= 1
+    bills.save()
+
+
+def test_unit_of_work_raises(tgfp_db):
+    bills: TGFPTeam = tgfp_db.find_teams(long_name='Bills')[0]
+    wins = bills.wins
+    with pytest.raises(RuntimeError):
+        with tgfp_db.unit_of_work():
+            bills.wins += 1
+            bills.save()
+            assert not bills.changed_data()
+            raise RuntimeError("nothing is written")
+    # the queued change isn't lost, the next save writes it
+    assert bills.changed_data() == {'wins': wins + 1}
+    assert TGFP(config.MONGO_URI).find_teams(long_name='Bills')[0].wins == wins
+    bills.save()
+    assert TGFP(config.MONGO_URI).find_teams(long_name='Bills')[0].wins == wins + 1
+    bills.wins = wins
+    bills.save()
@@ -0,0 +1,125 @@
+""" Test module for the cache watcher """
+import os
+import time
+
+import pytest
+from pymongo.errors import AutoReconnect, OperationFailure, ServerSelectionTimeoutError
+
+from tgfp import TGFP, TGFPGame
+from config import get_config, Config
+
+from tgfp_lib.watcher import TGFPCacheWatcher
+
+config: Config = get_config()
+
+# a single node replica set, see tgfp-mongodb-rs in dev-docker-compose.yaml
+REPLICA_SET_URI = os.environ.get('TGFP_REPLICA_SET_URI')
+
+
+# pylint: disable=redefined-outer-name
+@pytest.fixture
+def tgfp_db(mocker):
+    """ The fixture database object with 2022 as the current season """
+    mocker.patch("tgfp.TGFP.current_season", return_value=2022)
+    return TGFP(config.MONGO_URI)
+
+
+def _wait_for(condition, timeout: float = 10.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.05)
+
+
+def _team(short_name: str, wins: int = 0) -> dict:
+    return {
+        'short_name': short_name,
+        'city': short_name.upper(),
+        'long_name': short_name,
+        'wins': wins,
+        'losses': 0,
+        'ties': 0,
+        'tgfp_nfl_team_id': short_name,
+        'logo_url': '',
+        'discord_emoji': ''
+    }
+
+
+# pylint: disable=missing-function-docstring
+def test_polling_applies_updates(tgfp_db):
+    game: TGFPGame = tgfp_db.find_games(week_no=1)[0]
+    original_spread = game.spread
+    watcher = TGFPCacheWatcher(tgfp_db, collections=('games',), use_change_stream=False)
+    watcher.poll()
+    writer = TGFP(config.MONGO_URI)
+    writers_game: TGFPGame = writer.find_games(game_id=game.id)[0]
+    writers_game.spread = original_spread + 1.5
+    writers_game.save()
+    try:
+        assert watcher.poll() == 1
+        # read again inside the overlap window, but already queued
+        assert watcher.poll() == 0
+        assert watcher.apply_pending() == 1
+        assert game.spread == original_spread + 1.5
+        assert tgfp_db.find_games(game_id=game.id)[0] is game
+        assert not game.changed_data()
+    finally:
+        writers_game.spread = original_spread
+        writers_game.save()
+    watcher.poll()
+    watcher.apply_pending()
+    assert game.spread == original_spread
+
+
+def test_change_stream_reopens(tgfp_db, mocker):
+    watcher = TGFPCacheWatcher(tgfp_db, collections=('games',), poll_interval=0.01)
+    errors = [AutoReconnect('connection reset'), ServerSelectionTimeoutError('no primary')]
+    opened = []
+
+    def watch():
+        opened.append(True)
+        if errors:
+            raise errors.pop(0)
+        # pylint: disable=protected-access
+        watcher._stop.wait()
+
+    mocker.patch.object(watcher, '_watch', side_effect=watch)
+    with watcher:
+        _wait_for(lambda: len(opened) == 3)
+    assert watcher.mode is None
+
+
+def test_change_stream_unavailable(tgfp_db, mocker):
+    watcher = TGFPCacheWatcher(tgfp_db, collections=('games',), poll_interval=0.01)
+    mocker.patch.object(
+        watcher, '_watch', side_effect=OperationFailure('The $changeStream stage is only '
+                                                        'supported on replica sets')
+    )
+    with watcher:
+        _wait_for(lambda: watcher.mode == 'polling')
+
+
+@pytest.mark.skipif(not REPLICA_SET_URI, reason="TGFP_REPLICA_SET_URI is not set")
+def test_change_stream():
+    tgfp = TGFP(REPLICA_SET_URI)
+    tgfp.mongodb.teams.delete_many({})
+    tgfp.mongodb.teams.insert_many([_team('buf'), _team('mia')])
+    bills = tgfp.find_teams(long_name='buf')[0]
+    writer = TGFP(REPLICA_SET_URI)
+    with TGFPCacheWatcher(tgfp, collections=('teams',)) as watcher:
+        _wait_for(lambda: watcher.mode is not None)
+        assert watcher.mode == 'change_stream'
+        writers_bills = writer.find_teams(long_name='buf')[0]
+        writers_bills.wins = 1
+        writers_bills.save()
+        writer.mongodb.teams.insert_one(_team('nyj', wins=2))
+        writer.mongodb.teams.delete_one({'short_name': 'mia'})
+        _wait_for(lambda: watcher.pending() == 3)
+        # unsaved local changes win over the incoming ones
+        bills.ties = 3
+        assert watcher.apply_pending() == 3
+    assert bills.wins == 1
+    assert bills.ties == 3
+    assert bills.changed_data() == {'ties': 3}
+    assert sorted(team.short_name for team in tgfp.teams()) == ['buf', 'nyj']
+    assert tgfp.find_teams(long_name='nyj')[0].wins == 2
@@ -2,6 +2,7 @@
 from .tgfp import TGFP, TGFPGame, TGFPTeam, TGFPPick, TGFPPlayer, TGFPClan
 
 __all__ = [
+    'AsyncTGFP',  # pylint: disable=undefined-all-variable
     'TGFP',
     'TGFPTeam',
     'TGFPPick',
@@ -9,3 +10,12 @@ __all__ = [
     'TGFPGame',
     'TGFPClan'
 ]
+
+
+def __getattr__(name: str):
+    # AsyncTGFP pulls in motor, only import it for the code that asks for it
+    if name == 'AsyncTGFP':
+        # pylint: disable=import-outside-toplevel
+        from .async_tgfp import AsyncTGFP
+        return AsyncTGFP
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
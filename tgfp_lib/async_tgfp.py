@@ -0,0 +1,342 @@
+"""
+  asyncio flavour of the TGFP class, reading and writing the great football pool mongo
+  database through motor
+"""
+from __future__ import annotations
+
+import asyncio
+import threading
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Dict, Hashable, List, Optional
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ReturnDocument
+
+from .tgfp import (
+    GAME_FIELDS,
+    PICK_FIELDS,
+    TGFP,
+    TGFPClan,
+    TGFPGame,
+    TGFPPick,
+    TGFPPlayer,
+    TGFPTeam,
+    _option_key
+)
+
+# process wide motor clients, see get_motor_client()
+_motor_clients: Dict[tuple, AsyncIOMotorClient] = {}
+_motor_clients_lock = threading.Lock()
+
+# games whose save asked for a rescore while an asave_model is writing, it rescores them
+# through motor once the write is done
+_deferred_rescores: ContextVar[Optional[List[TGFPGame]]] = ContextVar(
+    'tgfp_deferred_rescores', default=None
+)
+
+
+def get_motor_client(mongo_uri: str, **client_options) -> AsyncIOMotorClient:
+    """
+    Returns the process wide AsyncIOMotorClient for ``mongo_uri`` on the running event loop,
+    creating it on first use.
+
+    The motor flavour of :func:`get_mongo_client`: ``client_options`` are part of the registry
+    key the same way, and so is the event loop, since a motor client stays bound to the loop
+    it is first used on.
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+    key = (loop, mongo_uri, _option_key(client_options))
+    with _motor_clients_lock:
+        client = _motor_clients.get(key)
+        if client is None:
+            client = AsyncIOMotorClient(mongo_uri, **client_options)
+            _motor_clients[key] = client
+    return client
+
+
+def close_motor_clients():
+    """ Closes and forgets every registered motor client (at shutdown, or between loops) """
+    with _motor_clients_lock:
+        for client in _motor_clients.values():
+            client.close()
+        _motor_clients.clear()
+
+
+# pylint: disable=missing-function-docstring
+# pylint: disable=too-many-instance-attributes
+class AsyncTGFP(TGFP):
+    """
+    TGFP for asyncio code (the discord bot, the async web front end)
+
+    The ``a`` prefixed methods are awaitable equivalents of the TGFP ones.  They go through
+    motor so the event loop never blocks, and fill the same caches the synchronous lookups
+    read, so once the data a request needs is loaded (``await tgfp.aload()``) the regular
+    ``find_*`` methods and the model properties answer from memory.  Concurrent requests for
+    the same collection / season share a single read.
+    """
+
+    def __init__(
+            self,
+            mongo_uri,
+            query_mode: bool = False,
+            *,
+            materialized_standings: bool = False,
+            metrics=None,
+            **client_options):
+        super().__init__(
+            mongo_uri,
+            query_mode=query_mode,
+            materialized_standings=materialized_standings,
+            metrics=metrics,
+            **client_options
+        )
+        if metrics is not None:
+            client_options['event_listeners'] = [
+                *client_options.get('event_listeners', ()), metrics.command_listener
+            ]
+        self._motor_uri = mongo_uri
+        self._motor_options = client_options
+        self._loads: Dict[Hashable, asyncio.Future] = {}
+
+    @property
+    def motorclient(self) -> AsyncIOMotorClient:
+        """ The shared motor client for this TGFP's uri and options on the running loop """
+        return get_motor_client(self._motor_uri, **self._motor_options)
+
+    @property
+    def motordb(self):
+        return self.motorclient['tgfp']
+
+    async def _afind(self, collection: str, query=None, projection=None) -> List[dict]:
+        cursor = self.motordb[collection].find(query or {}, projection, batch_size=100000)
+        return await cursor.to_list(None)
+
+    async def _load_once(self, key: Hashable, load: Callable[[], Awaitable[None]]):
+        """ Runs ``load`` once for ``key``, callers arriving while it runs wait for it """
+        future = self._loads.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._measured_load(key, load))
+            self._loads[key] = future
+        try:
+            await future
+        except Exception:
+            self._loads.pop(key, None)
+            raise
+
+    async def _measured_load(self, key: Hashable, load: Callable[[], Awaitable[None]]):
+        collection = key if isinstance(key, str) else key[0]
+        with self._measure(f'load_{collection}'):
+            await load()
+
+    async def aload(self, season: Optional[int] = None):
+        """
+        Loads teams, players, clans and the games / picks of ``season`` (default: current
+        season) concurrently
+        """
+        season = season or await self.acurrent_season()
+        await asyncio.gather(
+            self.ateams(),
+            self.aplayers(),
+            self.aclans(),
+            self.afind_games(season=season),
+            self.afind_picks(season=season)
+        )
+
+    async def acurrent_season(self) -> int:
+        if not self._current_season:
+            tgfp_info = await self.motordb.tgfp_info.find_one()
+            self._current_season = tgfp_info['current_season']
+        return self._current_season
+
+    async def ateams(self) -> List[TGFPTeam]:
+        async def load():
+            self._teams = [self._materialize(TGFPTeam, team) for team in await self._afind('teams')]
+
+        await self._load_once('teams', load)
+        return self.teams()
+
+    async def aplayers(self) -> List[TGFPPlayer]:
+        async def load():
+            self._players = [
+                self._materialize(TGFPPlayer, player) for player in await self._afind('players')
+            ]
+
+        await self._load_once('players', load)
+        return self.players()
+
+    async def aclans(self, ordered_by=None, reverse_order=False) -> List[TGFPClan]:
+        async def load():
+            self._clans = [self._materialize(TGFPClan, clan) for clan in await self._afind('clans')]
+
+        await self._load_once('clans', load)
+        if ordered_by == "total_points":
+            await asyncio.gather(self.aplayers(), self.afind_picks(), self._aload_last_week())
+        return self.clans(ordered_by=ordered_by, reverse_order=reverse_order)
+
+    async def _aseason_partition(
+            self,
+            collection: str,
+            partitions: Dict[int, list],
+            model: type,
+            season: Optional[int]):
+        """ Awaitable counterpart of ``TGFP._season_partition`` that only fills the cache """
+        if season is not None and season in partitions:
+            return
+        if season is None and collection in self._fully_loaded:
+            return
+
+        async def load():
+            if season is not None:
+                documents = await self._afind(collection, {'season': season})
+                partitions[season] = [self._materialize(model, document) for document in documents]
+                return
+            documents = await self._afind(collection, {'season': {'$nin': list(partitions)}})
+            for document in documents:
+                partitions.setdefault(document['season'], []).append(
+                    self._materialize(model, document))
+            self._fully_loaded.add(collection)
+
+        await self._load_once((collection, season), load)
+
+    async def agames(self, season: Optional[int] = None) -> List[TGFPGame]:
+        await self._aseason_partition('games', self._games, TGFPGame, season)
+        return self.games(season)
+
+    async def apicks(self, season: Optional[int] = None) -> List[TGFPPick]:
+        await self._aseason_partition('picks', self._picks, TGFPPick, season)
+        return self.picks(season)
+
+    async def _aquery(self, collection: str, query: dict, model: type, fields: tuple):
+        """ Awaitable counterpart of ``TGFP._query``, fills the same per query cache """
+        key = self._query_key(collection, query)
+        if key not in self._query_cache:
+            documents = await self._afind(collection, query, {field: 1 for field in fields})
+            self._query_cache[key] = [self._materialize(model, document) for document in documents]
+
+    async def afind_picks(
+            self,
+            pick_id=None,
+            week_no=None,
+            season=None,
+            player_id=None
+    ) -> List[TGFPPick]:
+        season = season or await self.acurrent_season()
+        if self._query_mode:
+            query = self._filter_query(
+                season, _id=pick_id, week_no=week_no, player_id=player_id)
+            await self._aquery('picks', query, TGFPPick, PICK_FIELDS)
+        else:
+            await self.apicks(season)
+        return self.find_picks(
+            pick_id=pick_id, week_no=week_no, season=season, player_id=player_id)
+
+    async def afind_games(
+            self,
+            game_id=None,
+            *,
+            tgfp_nfl_game_id=None,
+            week_no=None,
+            season=None,
+            home_team_id=None,
+            ordered_by=None) -> List[TGFPGame]:
+        # pylint: disable=too-many-arguments
+        season = season or await self.acurrent_season()
+        if self._query_mode:
+            query = self._filter_query(
+                season,
+                _id=game_id,
+                tgfp_nfl_game_id=tgfp_nfl_game_id,
+                week_no=week_no,
+                home_team_id=home_team_id
+            )
+            await self._aquery('games', query, TGFPGame, GAME_FIELDS)
+        else:
+            await self.agames(season)
+        return self.find_games(
+            game_id=game_id,
+            tgfp_nfl_game_id=tgfp_nfl_game_id,
+            week_no=week_no,
+            season=season,
+            home_team_id=home_team_id,
+            ordered_by=ordered_by
+        )
+
+    async def afind_players(self, ordered_by=None, **filters) -> List[TGFPPlayer]:
+        await self.aplayers()
+        if ordered_by == "total_points":
+            await self.afind_picks()
+        return self.find_players(ordered_by=ordered_by, **filters)
+
+    async def _aload_last_week(self):
+        """ Reads everything current_week / current_active_week look at """
+        games = await self.afind_games()
+        if games:
+            await self.afind_games(week_no=max(game.week_no for game in games))
+
+    async def acurrent_week(self) -> int:
+        await self._aload_last_week()
+        return self.current_week()
+
+    async def acurrent_active_week(self) -> int:
+        await self._aload_last_week()
+        return self.current_active_week()
+
+    async def aaggregate_standings(
+            self,
+            season: Optional[int] = None,
+            week_no: Optional[int] = None,
+            by_week: bool = False) -> List[dict]:
+        """ Awaitable ``aggregate_standings`` """
+        season = season or await self.acurrent_season()
+        active_week = None if by_week else await self.acurrent_active_week()
+        pipeline = self._standings_pipeline(season, active_week, week_no, by_week)
+        return await self.motordb.picks.aggregate(pipeline).to_list(None)
+
+    def rescore_game(self, game: TGFPGame) -> List[TGFPPick]:
+        """
+        Defers the rescore of a game saved by ``asave_model`` until its write is done, so
+        it runs through motor.  Saved any other way (``save()``, a unit of work flush) the
+        game is rescored right away by ``TGFP.rescore_game``.
+        """
+        deferred = _deferred_rescores.get()
+        if deferred is None:
+            return super().rescore_game(game)
+        deferred.append(game)
+        return []
+
+    async def arescore_game(self, game: TGFPGame) -> List[TGFPPick]:
+        """ Awaitable ``rescore_game`` """
+        await asyncio.gather(
+            self.afind_picks(week_no=game.week_no, season=game.season),
+            self.afind_games(week_no=game.week_no, season=game.season)
+        )
+        changed = self._rescore(game, self._picks_for_game(game))
+        for pick in changed:
+            await pick.asave()
+        self._notify_rescored(game, changed)
+        return changed
+
+    async def asave_model(self, model):
+        """ Awaitable ``save_model``, used by the models' ``asave()`` """
+        write = self._save_write(model)
+        if write is None:
+            return
+        with self._measure('save'):
+            collection, query, update, projection, upsert = write
+            stored = await self.motordb[collection].find_one_and_update(
+                query, update, projection, upsert=upsert, return_document=ReturnDocument.BEFORE
+            )
+            rescores: List[TGFPGame] = []
+            token = _deferred_rescores.set(rescores)
+            try:
+                increments = self._save_written(model, write, stored)
+            finally:
+                _deferred_rescores.reset(token)
+            if increments:
+                await self.motordb.standings.bulk_write(self._standings_requests(increments))
+                self._standings_written(increments)
+        for game in rescores:
+            await self.arescore_game(game)
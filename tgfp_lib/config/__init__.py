@@ -1,7 +1,13 @@
 """ Configuration Module """
-from .config import Config, get_config
+from .cache import SettingsCache
+from .config import Config, Setting, get_config
+from .prefect_helpers import LocalHelper, PrefectHelper
 
 __all__ = [
     "Config",
+    "LocalHelper",
+    "PrefectHelper",
+    "Setting",
+    "SettingsCache",
     "get_config"
 ]
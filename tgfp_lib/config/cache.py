@@ -0,0 +1,62 @@
+""" Encrypted local file cache for resolved config values """
+import base64
+import hashlib
+import json
+import os
+from typing import Dict, Optional
+
+
+class SettingsCache:
+    """
+    Keeps resolved config values in a local file so a cold start doesn't have to ask prefect
+
+    The file is a Fernet token (``cryptography``, which prefect already depends on), so it
+    is encrypted, tamper checked and timestamped: entries older than ``ttl`` seconds, written
+    for another environment or with another key are ignored and fetched again.
+    """
+    def __init__(self, path: str, key: str, environment: str, ttl: int = 3600):
+        # pylint: disable=import-outside-toplevel
+        from cryptography.fernet import Fernet
+
+        self.path: str = path
+        self.ttl: int = ttl
+        self._environment: str = environment
+        # any passphrase will do, Fernet wants 32 url-safe base64 encoded bytes
+        self._fernet = Fernet(base64.urlsafe_b64encode(hashlib.sha256(key.encode()).digest()))
+
+    @classmethod
+    def from_environ(cls, environment: str) -> Optional['SettingsCache']:
+        """
+        Cache configured by ``TGFP_CONFIG_CACHE`` (file path), ``TGFP_CONFIG_CACHE_KEY`` and
+        optionally ``TGFP_CONFIG_CACHE_TTL`` (seconds), None unless both path and key are set
+        """
+        path = os.getenv('TGFP_CONFIG_CACHE')
+        key = os.getenv('TGFP_CONFIG_CACHE_KEY')
+        if not path or not key:
+            return None
+        return cls(path, key, environment, int(os.getenv('TGFP_CONFIG_CACHE_TTL', '3600')))
+
+    def load(self) -> Dict[str, str]:
+        """ Returns the cached values, empty when missing, expired or unreadable """
+        # pylint: disable=import-outside-toplevel
+        from cryptography.fernet import InvalidToken
+
+        try:
+            with open(self.path, 'rb') as cache_file:
+                data = json.loads(self._fernet.decrypt(cache_file.read(), ttl=self.ttl))
+        except (OSError, ValueError, InvalidToken):
+            return {}
+        if data.get('environment') != self._environment:
+            return {}
+        return data['values']
+
+    def save(self, values: Dict[str, str]):
+        """ Writes ``values`` (readable by the owner only) """
+        token = self._fernet.encrypt(
+            json.dumps({'environment': self._environment, 'values': values}).encode()
+        )
+        temp_path = f"{self.path}.tmp"
+        file_descriptor = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(file_descriptor, 'wb') as cache_file:
+            cache_file.write(token)
+        os.replace(temp_path, self.path)
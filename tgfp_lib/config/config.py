@@ -1,34 +1,144 @@
 """ Configuration file """
+import functools
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
 
-from .prefect_helpers import PrefectHelper
+from .cache import SettingsCache
+from .prefect_helpers import LocalHelper, PrefectHelper
 
 
 # pylint: disable=too-few-public-methods
+class Setting:
+    """
+    A config value stored in prefect, fetched the first time it's read from a Config
+
+    Args:
+        name: prefect secret / variable name without the environment suffix
+        secret: True for a prefect Secret block, False for a prefect variable
+        environ: environment variable to export the value to once it's resolved
+    """
+    def __init__(self, name: str, secret: bool = False, environ: Optional[str] = None):
+        self.name: str = name
+        self.secret: bool = secret
+        self.environ: Optional[str] = environ
+        self.attr: str = name
+
+    def __set_name__(self, owner, attr: str):
+        self.attr = attr
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            # Config.MONGO_URI reads from the shared config, like the class attributes did
+            return _shared_config().resolve(self)
+        return instance.resolve(self)
+
+
 class Config:
-    """ Base configuration class """
-    ENVIRONMENT: str = os.getenv('ENVIRONMENT')
-    assert ENVIRONMENT is not None
-    helper = PrefectHelper(ENVIRONMENT)
-
-    MONGO_URI: str = helper.get_secret('mongo-uri')
-    MONGO_ROOT_USERNAME: str = helper.get_secret('mongo-root-username')
-    MONGO_ROOT_PASSWORD: str = helper.get_secret('mongo-root-password')
-    MONGO_HOST: str = helper.get_variable('mongo_host')
-    OAUTHLIB_INSECURE_TRANSPORT: str = helper.get_variable('discord_oauthlib_insecure_transport')
-    os.environ['OAUTHLIB_INSECURE_TRANSPORT'] = OAUTHLIB_INSECURE_TRANSPORT
-    DISCORD_CLIENT_ID: str = helper.get_secret('discord-client-id')
-    DISCORD_CLIENT_SECRET: str = helper.get_secret('discord-client-secret')
-    DISCORD_REDIRECT_URI: str = helper.get_variable('discord_redirect_uri')
-    DISCORD_AUTH_TOKEN: str = helper.get_secret('discord-auth-token')
-    DISCORD_GUILD_NAME: str = helper.get_variable('discord_guild_name')
-    BACKUP_DIR = helper.get_variable('backup_dir')
-    SECRET_KEY = helper.get_secret('web-secret-key')
-    LISTMONK_AUTH_HASH = helper.get_variable('listmonk_auth_hash')
-    LISTMONK_LIST_ID = helper.get_variable('listmonk_list_id')
-    LISTMONK_API_URL = helper.get_variable('listmonk_api_url')
+    """
+    Base configuration class
+
+    Values are resolved lazily on first access and remembered, :meth:`warm` fetches all of
+    them concurrently.  Set ``TGFP_LOCAL_CONFIG`` to a JSON file to read the values from it
+    instead of prefect, and ``TGFP_CONFIG_CACHE`` / ``TGFP_CONFIG_CACHE_KEY`` to keep them in an
+    encrypted local cache file (see :class:`SettingsCache`).
+
+    Reading a setting on the class (``Config.MONGO_URI``) resolves it through the shared
+    :func:`get_config` instance, ``vars(Config)`` / :meth:`settings` give the Settings.
+    """
+    # the instance's environment may differ, see __init__
+    ENVIRONMENT: Optional[str] = os.getenv('ENVIRONMENT')
+    MONGO_URI: str = Setting('mongo-uri', secret=True)
+    MONGO_ROOT_USERNAME: str = Setting('mongo-root-username', secret=True)
+    MONGO_ROOT_PASSWORD: str = Setting('mongo-root-password', secret=True)
+    MONGO_HOST: str = Setting('mongo_host')
+    OAUTHLIB_INSECURE_TRANSPORT: str = Setting(
+        'discord_oauthlib_insecure_transport', environ='OAUTHLIB_INSECURE_TRANSPORT'
+    )
+    DISCORD_CLIENT_ID: str = Setting('discord-client-id', secret=True)
+    DISCORD_CLIENT_SECRET: str = Setting('discord-client-secret', secret=True)
+    DISCORD_REDIRECT_URI: str = Setting('discord_redirect_uri')
+    DISCORD_AUTH_TOKEN: str = Setting('discord-auth-token', secret=True)
+    DISCORD_GUILD_NAME: str = Setting('discord_guild_name')
+    BACKUP_DIR: str = Setting('backup_dir')
+    SECRET_KEY: str = Setting('web-secret-key', secret=True)
+    LISTMONK_AUTH_HASH: str = Setting('listmonk_auth_hash')
+    LISTMONK_LIST_ID: str = Setting('listmonk_list_id')
+    LISTMONK_API_URL: str = Setting('listmonk_api_url')
+
+    def __init__(self, environment: Optional[str] = None, helper=None, cache=None):
+        """
+        Args:
+            environment: prefect environment suffix, default ``ENVIRONMENT`` from the env
+            helper: PrefectHelper / LocalHelper to fetch values with
+            cache: SettingsCache, by default the one configured in the environment (if any)
+        """
+        # pylint: disable=invalid-name
+        self.ENVIRONMENT: str = environment or os.getenv('ENVIRONMENT')
+        assert self.ENVIRONMENT is not None
+        if helper is None:
+            if os.getenv('TGFP_LOCAL_CONFIG'):
+                helper = LocalHelper(self.ENVIRONMENT)
+            else:
+                helper = PrefectHelper(self.ENVIRONMENT)
+        self.helper = helper
+        self._cache: Optional[SettingsCache] = cache or SettingsCache.from_environ(
+            self.ENVIRONMENT
+        )
+        self._lock = threading.Lock()
+        self._values: Dict[str, str] = self._cache.load() if self._cache else {}
+        for setting in self.settings():
+            if setting.environ and setting.attr in self._values:
+                os.environ[setting.environ] = self._values[setting.attr]
+
+    @classmethod
+    def settings(cls) -> List[Setting]:
+        """ Every Setting declared on the class """
+        return [value for value in vars(cls).values() if isinstance(value, Setting)]
+
+    def _fetch(self, setting: Setting) -> str:
+        if setting.secret:
+            return self.helper.get_secret(setting.name)
+        return self.helper.get_variable(setting.name)
+
+    def _store(self, fetched: Dict[Setting, str]):
+        with self._lock:
+            for setting, value in fetched.items():
+                self._values[setting.attr] = value
+                if setting.environ:
+                    os.environ[setting.environ] = value
+            if self._cache and fetched:
+                self._cache.save(self._values)
+
+    def resolve(self, setting: Setting) -> str:
+        """ Returns the value of ``setting``, fetching it on first use """
+        try:
+            return self._values[setting.attr]
+        except KeyError:
+            pass
+        value = self._fetch(setting)
+        self._store({setting: value})
+        return value
+
+    def warm(self, max_workers: int = 8):
+        """ Fetches every value not resolved yet concurrently """
+        missing = [setting for setting in self.settings() if setting.attr not in self._values]
+        if not missing:
+            return
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            values = executor.map(self._fetch, missing)
+            self._store(dict(zip(missing, values)))
+
+
+@functools.lru_cache(maxsize=None)
+def _shared_config() -> Config:
+    return Config()
 
 
 def get_config():
     """ Factory method for returning the correct config"""
-    return Config()
+    config = _shared_config()
+    # web clients rely on this being exported as soon as the config is handed out
+    config.resolve(vars(Config)['OAUTHLIB_INSECURE_TRANSPORT'])
+    return config
@@ -1,6 +1,7 @@
 """ Nag Players module """
-from .helpers import PrefectHelper
+from .helpers import LocalHelper, PrefectHelper
 
 __all__ = [
+    "LocalHelper",
     "PrefectHelper"
 ]
@@ -1,8 +1,7 @@
 """ Helpers for Prefect """
+import json
 import os
-
-from prefect import variables
-from prefect.blocks.system import Secret
+from typing import Dict, Optional
 
 
 class PrefectHelper:
@@ -12,10 +11,41 @@ class PrefectHelper:
 
     def get_secret(self, secret_name: str) -> str:
         """ Retrieves the secret, using the current environment """
+        # prefect is slow to import, only pay for it when a value is actually fetched
+        # pylint: disable=import-outside-toplevel
+        from prefect.blocks.system import Secret
+
         assert os.getenv('PREFECT_API_KEY')
         assert os.getenv('PREFECT_API_URL')
         return Secret.load(f"{secret_name}-{self._env}").get()
 
     def get_variable(self, variable_name: str) -> str:
         """ Retrieves the variable, using the current environment """
+        # pylint: disable=import-outside-toplevel
+        from prefect import variables
+
         return str(variables.get(f"{variable_name}_{self._env}"))
+
+
+class LocalHelper:
+    """
+    Stand-in for PrefectHelper that never touches the network (tests, offline development)
+
+    Values come from ``values`` or, by default, the JSON object in the file named by the
+    ``TGFP_LOCAL_CONFIG`` environment variable.  Keys are the prefect names without the
+    environment suffix, e.g. ``{"mongo-uri": "mongodb://localhost", "mongo_host": "localhost"}``
+    """
+    def __init__(self, environment: str, values: Optional[Dict[str, str]] = None):
+        self._env: str = environment
+        if values is None:
+            with open(os.environ['TGFP_LOCAL_CONFIG'], encoding='utf-8') as config_file:
+                values = json.load(config_file)
+        self._values: Dict[str, str] = values
+
+    def get_secret(self, secret_name: str) -> str:
+        """ Retrieves the secret from the local values """
+        return self._values[secret_name]
+
+    def get_variable(self, variable_name: str) -> str:
+        """ Retrieves the variable from the local values """
+        return str(self._values[variable_name])
@@ -0,0 +1,32 @@
+"""
+  Creates the indexes the library relies on and checks that none of its queries still
+  scans a whole collection
+
+  usage: python -m tgfp_lib.ensure_indexes [--check] [season]
+    --check: only run the query plan check, don't create indexes
+"""
+import sys
+from typing import List, Optional
+
+from .config import get_config
+from .tgfp import TGFP
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """ Ensures the indexes, returns 1 when a query shape is answered with a COLLSCAN """
+    argv = sys.argv[1:] if argv is None else argv
+    check_only = '--check' in argv
+    arguments = [argument for argument in argv if argument != '--check']
+    season = int(arguments[0]) if arguments else None
+    tgfp = TGFP(get_config().MONGO_URI)
+    if not check_only:
+        for collection, names in tgfp.ensure_indexes().items():
+            print(f"{collection}: {', '.join(names)}")
+    scans = tgfp.diagnose_query_plans(season)
+    for collection, command in scans:
+        print(f"COLLSCAN on {collection}: {command}")
+    return 1 if scans else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
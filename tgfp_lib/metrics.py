@@ -0,0 +1,191 @@
+"""
+  Opt-in instrumentation for TGFP: mongo command monitoring plus call counts and latency
+  histograms for the find_* methods, the week lookups, cache loads and saves
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Tuple
+
+from pymongo import monitoring
+
+# histogram bucket upper bounds, in seconds (prometheus convention)
+BUCKETS: Tuple[float, ...] = (
+    0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0
+)
+
+
+class Histogram:
+    """ Latency histogram with the fixed :data:`BUCKETS` """
+    __slots__ = ('counts', 'count', 'total')
+
+    def __init__(self):
+        # one count per bucket plus the +Inf overflow, not cumulative
+        self.counts: List[int] = [0] * (len(BUCKETS) + 1)
+        self.count: int = 0
+        self.total: float = 0.0
+
+    def observe(self, seconds: float):
+        """ Records one observation of ``seconds`` """
+        self.counts[bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+
+    def snapshot(self) -> dict:
+        """ count, sum and cumulative bucket counts keyed by upper bound """
+        cumulative = 0
+        buckets = {}
+        for bound, count in zip(BUCKETS + (float('inf'),), self.counts):
+            cumulative += count
+            buckets['+Inf' if bound == float('inf') else repr(bound)] = cumulative
+        return {'count': self.count, 'sum_seconds': self.total, 'buckets': buckets}
+
+
+class QueryCount:
+    """ Mongo commands started while a :meth:`TGFPMetrics.count_queries` block ran """
+    __slots__ = ('commands',)
+
+    def __init__(self):
+        self.commands: List[Tuple[str, str]] = []
+
+    @property
+    def count(self) -> int:
+        """ Number of commands started """
+        return len(self.commands)
+
+    def __repr__(self):
+        return f"QueryCount({self.count}: {self.commands})"
+
+
+class _CommandListener(monitoring.CommandListener):
+    def __init__(self, metrics: 'TGFPMetrics'):
+        self._metrics = metrics
+
+    def started(self, event: monitoring.CommandStartedEvent):
+        # pylint: disable=protected-access
+        self._metrics._command_started(event)
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent):
+        # pylint: disable=protected-access
+        self._metrics._command_finished(event.command_name, event.duration_micros, False)
+
+    def failed(self, event: monitoring.CommandFailedEvent):
+        # pylint: disable=protected-access
+        self._metrics._command_finished(event.command_name, event.duration_micros, True)
+
+
+class TGFPMetrics:
+    """
+    Collects TGFP instrumentation, enable it with ``TGFP(mongo_uri, metrics=TGFPMetrics())``.
+
+    The mongo command listener can only be attached when TGFP creates (or picks from the
+    registry) its own client, pass ``event_listeners=[metrics.command_listener]`` when
+    building a client by hand.  Read the numbers with :meth:`snapshot` or
+    :meth:`prometheus_text`, and use :meth:`count_queries` in tests::
+
+        with metrics.count_queries() as queries:
+            render_standings_page(tgfp)
+        assert queries.count <= 3
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, Histogram] = {}
+        self._commands: Dict[str, Histogram] = {}
+        self._failed_commands: Dict[str, int] = {}
+        self._query_counts: List[QueryCount] = []
+        self.command_listener: monitoring.CommandListener = _CommandListener(self)
+
+    def observe(self, name: str, seconds: float):
+        """ Records one call of ``name`` that took ``seconds`` """
+        with self._lock:
+            histogram = self._calls.get(name)
+            if histogram is None:
+                histogram = self._calls[name] = Histogram()
+            histogram.observe(seconds)
+
+    @contextmanager
+    def timed(self, name: str) -> Iterator[None]:
+        """ Times the ``with`` block as one call of ``name`` """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    @contextmanager
+    def count_queries(self) -> Iterator[QueryCount]:
+        """
+        Counts the mongo commands started during the ``with`` block (by any thread using a
+        client this listener is attached to)
+        """
+        query_count = QueryCount()
+        with self._lock:
+            self._query_counts.append(query_count)
+        try:
+            yield query_count
+        finally:
+            with self._lock:
+                self._query_counts.remove(query_count)
+
+    def _command_started(self, event: monitoring.CommandStartedEvent):
+        collection = event.command.get(event.command_name)
+        with self._lock:
+            for query_count in self._query_counts:
+                query_count.commands.append(
+                    (event.command_name, collection if isinstance(collection, str) else '')
+                )
+
+    def _command_finished(self, command_name: str, duration_micros: int, failed: bool):
+        with self._lock:
+            histogram = self._commands.get(command_name)
+            if histogram is None:
+                histogram = self._commands[command_name] = Histogram()
+            histogram.observe(duration_micros / 1_000_000)
+            if failed:
+                self._failed_commands[command_name] = \
+                    self._failed_commands.get(command_name, 0) + 1
+
+    def reset(self):
+        """ Forgets everything recorded so far """
+        with self._lock:
+            self._calls.clear()
+            self._commands.clear()
+            self._failed_commands.clear()
+
+    def snapshot(self) -> dict:
+        """ Everything recorded so far, as plain dicts """
+        with self._lock:
+            return {
+                'calls': {name: histogram.snapshot() for name, histogram in self._calls.items()},
+                'commands': {
+                    name: histogram.snapshot() for name, histogram in self._commands.items()
+                },
+                'failed_commands': dict(self._failed_commands),
+            }
+
+    def prometheus_text(self, prefix: str = 'tgfp') -> str:
+        """ The snapshot in the Prometheus text exposition format """
+        snapshot = self.snapshot()
+        lines: List[str] = []
+        for metric, label, histograms, description in (
+                ('call_duration_seconds', 'method', snapshot['calls'],
+                 "Duration of instrumented TGFP calls"),
+                ('mongo_command_duration_seconds', 'command', snapshot['commands'],
+                 "Duration of mongo commands"),
+        ):
+            name = f"{prefix}_{metric}"
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} histogram")
+            for value, histogram in sorted(histograms.items()):
+                for bound, count in histogram['buckets'].items():
+                    lines.append(f'{name}_bucket{{{label}="{value}",le="{bound}"}} {count}')
+                lines.append(f'{name}_sum{{{label}="{value}"}} {histogram["sum_seconds"]}')
+                lines.append(f'{name}_count{{{label}="{value}"}} {histogram["count"]}')
+        name = f"{prefix}_mongo_command_failures_total"
+        lines.append(f"# HELP {name} Failed mongo commands")
+        lines.append(f"# TYPE {name} counter")
+        for command, count in sorted(snapshot['failed_commands'].items()):
+            lines.append(f'{name}{{command="{command}"}} {count}')
+        return "\n".join(lines) + "\n"
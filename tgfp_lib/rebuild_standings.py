@@ -0,0 +1,25 @@
+"""
+  Rebuilds the materialized standings collection from the picks and verifies it
+
+  usage: python -m tgfp_lib.rebuild_standings [season]
+"""
+import sys
+from typing import List, Optional
+
+from .config import get_config
+from .tgfp import TGFP
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """ Rebuilds ``season`` (default: current season), returns 1 when verification fails """
+    argv = sys.argv[1:] if argv is None else argv
+    season = int(argv[0]) if argv else None
+    tgfp = TGFP(get_config().MONGO_URI, materialized_standings=True)
+    mismatches = tgfp.rebuild_standings_collection(season)
+    for player_id, week_no, stat, stored, computed in mismatches:
+        print(f"player {player_id} week {week_no} {stat}: stored {stored}, computed {computed}")
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,16 +2,36 @@
   This module contains all the necessary functions for interfacing with
   the great football pool mongo database
 """
+# pylint: disable=too-many-lines
 from __future__ import annotations
 
-import pprint
-from typing import List, Optional
+import copy
+import functools
+import threading
+from contextvars import ContextVar
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timezone
+from collections.abc import MutableSequence
+from itertools import accumulate
+from typing import TYPE_CHECKING, Callable, Dict, Hashable, Iterable, Iterator, List, Optional
 
-import pytz
-from pymongo import MongoClient
 from bson import ObjectId
 
-pp = pprint.PrettyPrinter(indent=4)
+# pymongo, pytz and pprint are imported where they're used, importing tgfp_lib has to stay
+# cheap for the short-lived cron scripts
+if TYPE_CHECKING:
+    from pymongo import MongoClient
+    from pymongo.results import BulkWriteResult
+
+
+def __getattr__(name: str):
+    # the module level pretty printer, built on first use
+    if name == 'pp':
+        # pylint: disable=import-outside-toplevel
+        import pprint
+        globals()['pp'] = pprint.PrettyPrinter(indent=4)
+        return globals()['pp']
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class GameNotFoundException(Exception):
@@ -20,90 +40,506 @@ class GameNotFoundException(Exception):
 
 PRO_BOWL_WEEK = 22
 
+# stands in for 'attribute not set yet' when tracking changed fields
+_UNSET = object()
+
+# Fields read by the model classes, used as projections for the pushed down queries
+GAME_FIELDS = (
+    'favorite_team_id', 'game_status', 'home_team_id', 'home_team_score', 'road_team_id',
+    'road_team_score', 'spread', 'start_time', 'week_no', 'season', 'tgfp_nfl_game_id',
+    'extra_info'
+)
+PICK_FIELDS = (
+    'lock_team_id', 'player_id', 'upset_team_id', 'week_no', 'season', 'wins', 'losses', 'bonus',
+    'pick_detail'
+)
+
+# per week stats kept by the standings tables, 'points' is wins + bonus
+STANDINGS_STATS = ('wins', 'losses', 'bonus', 'points')
+# the fields identifying a document of the materialized standings collection
+STANDINGS_KEY = ('season', 'player_id', 'week_no')
+
+# (keys, options) of the indexes the queries and upserts rely on, see TGFP.ensure_indexes()
+UPDATED_AT_INDEX = ([('updated_at', 1)], {})
+INDEXES: Dict[str, List[tuple]] = {
+    'games': [
+        # the save filter, an upsert on a non unique field can insert duplicates
+        ([('tgfp_nfl_game_id', 1)], {'unique': True}),
+        ([('season', 1), ('week_no', 1)], {}),
+        UPDATED_AT_INDEX,
+    ],
+    'picks': [
+        # the save filter, its player_id prefix serves pick_history
+        ([('player_id', 1), ('week_no', 1), ('season', 1)], {'unique': True}),
+        ([('season', 1), ('week_no', 1)], {}),
+        UPDATED_AT_INDEX,
+    ],
+    'standings': [
+        ([('season', 1), ('player_id', 1), ('week_no', 1)], {'unique': True}),
+    ],
+    'teams': [UPDATED_AT_INDEX],
+    'players': [UPDATED_AT_INDEX],
+    'clans': [UPDATED_AT_INDEX],
+}
+
+# process wide MongoClients keyed by uri + client options, see get_mongo_client()
+_mongo_clients: Dict[tuple, MongoClient] = {}
+_mongo_clients_lock = threading.Lock()
+
+# (identity map, unit of work) of every unit_of_work() open in the current thread / task,
+# a TGFP and its views share the identity map so a save joins whichever of them opened it
+_open_units_of_work: ContextVar[tuple] = ContextVar('tgfp_units_of_work', default=())
+
+
+def _option_key(value):
+    """ Hashable stand-in for a MongoClient option value (lists / dicts of listeners etc.) """
+    if isinstance(value, (list, tuple)):
+        return tuple(_option_key(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, _option_key(item)) for key, item in value.items()))
+    return value
+
+
+def get_mongo_client(mongo_uri: str, **client_options) -> MongoClient:
+    """
+    Returns the process wide MongoClient for ``mongo_uri``, creating it on first use.
+
+    ``client_options`` are handed to MongoClient (e.g. ``maxPoolSize``, ``minPoolSize``,
+    ``connectTimeoutMS``, ``serverSelectionTimeoutMS``) and are part of the registry key, so
+    callers asking for different pool settings get their own client.
+    """
+    # pylint: disable=import-outside-toplevel
+    from pymongo import MongoClient
+
+    key = (mongo_uri, _option_key(client_options))
+    with _mongo_clients_lock:
+        client = _mongo_clients.get(key)
+        if client is None:
+            client = MongoClient(mongo_uri, **client_options)
+            _mongo_clients[key] = client
+    return client
+
+
+def close_mongo_clients():
+    """ Closes and forgets every registered client (at shutdown, or in a forked child) """
+    with _mongo_clients_lock:
+        for client in _mongo_clients.values():
+            client.close()
+        _mongo_clients.clear()
+
+
+def _instrumented(name: str):
+    """ Times the decorated TGFP method as ``name`` when the instance has metrics """
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if self.metrics is None:
+                return method(self, *args, **kwargs)
+            with self.metrics.timed(name):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorate
+
 
 # pylint: disable=missing-function-docstring
 # pylint: disable=too-many-instance-attributes
+# pylint: disable=too-many-public-methods
 class TGFP:
     """
     Main class for the great football pool
     """
 
-    def __init__(self, mongo_uri):
+    def __init__(
+            self,
+            mongo_uri,
+            query_mode: bool = False,
+            client: Optional[MongoClient] = None,
+            *,
+            materialized_standings: bool = False,
+            metrics=None,
+            **client_options):
+        """
+        Args:
+            mongo_uri: connection string for the tgfp mongo database
+            query_mode: when True, ``find_games`` / ``find_picks`` send their filters to mongo
+              (with a field projection) instead of loading every document, caching the
+              results per query.  Meant for short-lived processes that only need a few rows.
+            client: MongoClient to use, by default the shared one from
+              :func:`get_mongo_client` for ``mongo_uri`` and ``client_options``
+            materialized_standings: when True, pick saves keep the ``standings`` collection
+              (one document per season, player and week) up to date with ``$inc`` deltas,
+              and ``find_players(ordered_by="total_points")`` ranks from it.  Build it first
+              with :meth:`rebuild_standings_collection`.
+            metrics: a ``tgfp_lib.metrics.TGFPMetrics`` to record call timings in, its mongo
+              command listener is added to the client options
+            client_options: pool / timeout options for the shared MongoClient
+        """
+        self._query_mode: bool = query_mode
+        self._materialized_standings: bool = materialized_standings
+        self._materialized_totals: Dict[int, Dict[ObjectId, int]] = {}
+        self._query_cache: Dict[tuple, list] = {}
         self._teams = []
-        self._games = []
-        self._picks = []
+        # games and picks are partitioned by season and loaded one season at a time
+        self._games: Dict[int, List[TGFPGame]] = {}
+        self._picks: Dict[int, List[TGFPPick]] = {}
+        self._fully_loaded: set = set()
         self._players = []
         self._clans = []
+        # collection -> {_id: the one live object for that document}
+        self._identity: Dict[str, Dict[ObjectId, TGFPModel]] = {}
+        # guards the loads / index builds of the caches above, shared with every view
+        # since views run on the web server's request threads
+        self._cache_lock = threading.RLock()
+        self._indexes: Dict[Hashable, tuple] = {}
+        self._standings: Dict[int, TGFPStandings] = {}
+        self._standings_matrices: Dict[int, TGFPStandingsMatrix] = {}
+        self._clan_standings: Dict[int, tuple] = {}
+        self._week_cache: Dict[str, int] = {}
+        self._seasons: Optional[List[int]] = None
+        self._subscribers: List[Callable[[TGFPGame, List[TGFPPick]], None]] = []
+        self._interned_ids: Dict[ObjectId, ObjectId] = {}
         self._home_page_text = ""
         self._current_season = 0
 
-        self.mongoclient: MongoClient = MongoClient(mongo_uri)
+        self.metrics = metrics
+        if metrics is not None and client is None:
+            client_options['event_listeners'] = [
+                *client_options.get('event_listeners', ()), metrics.command_listener
+            ]
+        self.mongoclient: MongoClient = client or get_mongo_client(mongo_uri, **client_options)
 
         self.mongodb = self.mongoclient['tgfp']
         self._home_page_text = None
         self._current_season = None
 
-    def games(self) -> List[TGFPGame]:
+    def view(self, query_mode: Optional[bool] = None) -> TGFP:
         """
-        Get an array of all TGFPGames in the entire db
+        Returns a cheap TGFP for a single request: it shares this instance's MongoClient and
+        read caches (including whatever either of them loads later), and the lock that keeps
+        two threads from loading the same cache at once.  Units of work follow
+        the calling thread / task rather than the view, so a ``save()`` of a cached object
+        joins the unit of work its caller opened, whichever view loaded the object.
         """
-        if not self._games:
-            for game in self.mongodb.games.find(batch_size=100000):
-                self._games.append(TGFPGame(tgfp=self, data=game))
-        return self._games
+        # pylint: disable=protected-access
+        request_view: TGFP = copy.copy(self)
+        if query_mode is not None:
+            request_view._query_mode = query_mode
+        return request_view
+
+    def _measure(self, name: str):
+        """ Context manager timing its block as ``name`` when metrics are enabled """
+        if self.metrics is None:
+            return nullcontext()
+        return self.metrics.timed(name)
+
+    def games(self, season: Optional[int] = None) -> List[TGFPGame]:
+        """
+        Get an array of the TGFPGames for ``season``, or of all TGFPGames in the entire db
+        """
+        return self._season_partition('games', self._games, TGFPGame, season)
 
     def teams(self) -> List[TGFPTeam]:
         """
         Get an array of all TGFPTeams in the entire DB
         """
         if not self._teams:
-            for team in self.mongodb.teams.find(batch_size=100000):
-                self._teams.append(TGFPTeam(tgfp=self, data=team))
+            self._load_collection('teams', self._teams, TGFPTeam)
         return self._teams
 
     def clans(self, ordered_by=None, reverse_order=False) -> List[TGFPClan]:
         if not self._clans:
-            for clan in self.mongodb.clans.find(batch_size=100000):
-                self._clans.append(TGFPClan(tgfp=self, data=clan))
+            self._load_collection('clans', self._clans, TGFPClan)
 
         all_clans = self._clans
         if ordered_by == "total_points":
-            all_clans.sort(key=lambda x: x.total_points, reverse=reverse_order)
+            rows = self._clan_standings_by_clan()
+            all_clans.sort(key=lambda x: rows[id(x)].total_points, reverse=reverse_order)
 
         return self._clans
 
-    def picks(self) -> List[TGFPPick]:
+    def picks(self, season: Optional[int] = None) -> List[TGFPPick]:
         """
-        Get an array of all the TGFPPicks in the db
+        Get an array of the TGFPPicks for ``season``, or of all the TGFPPicks in the db
         """
-        if not self._picks:
-            for pick in self.mongodb.picks.find(batch_size=100000):
-                self._picks.append(TGFPPick(tgfp=self, data=pick))
-        return self._picks
+        return self._season_partition('picks', self._picks, TGFPPick, season)
 
     def players(self) -> List[TGFPPlayer]:
         """
         Get a list of all the TGFPPlayers in the db
         """
         if not self._players:
-            for player in self.mongodb.players.find(batch_size=100000):
-                self._players.append(TGFPPlayer(tgfp=self, data=player))
+            self._load_collection('players', self._players, TGFPPlayer)
         return self._players
 
+    def _load_collection(self, collection: str, items: list, model: type):
+        """
+        Reads the whole of ``collection`` into the empty cached list ``items``, once: a
+        thread arriving while another one loads it waits and finds it loaded
+        """
+        with self._cache_lock:
+            if items:
+                return
+            with self._measure(f'load_{collection}'):
+                loaded = [
+                    self._materialize(model, document)
+                    for document in self.mongodb[collection].find(batch_size=100000)
+                ]
+            # the list only ever shows up empty or whole
+            items.extend(loaded)
+
+    def _season_partition(
+            self,
+            collection: str,
+            partitions: Dict[int, list],
+            model: type,
+            season: Optional[int] = None) -> list:
+        """
+        Returns the cached ``collection`` objects for ``season``, reading that season from the
+        database the first time it is asked for.  With no season every season not loaded yet
+        is read and the partitions are returned as one list ordered by season.
+        """
+        if season is not None:
+            if season not in partitions:
+                with self._cache_lock:
+                    if season not in partitions:
+                        with self._measure(f'load_{collection}'):
+                            partitions[season] = [
+                                self._materialize(model, document)
+                                for document in self.mongodb[collection].find(
+                                    {'season': season}, batch_size=100000)
+                            ]
+            return partitions[season]
+
+        self._ensure_all_seasons(collection, partitions, model)
+        return [item for key in sorted(partitions) for item in partitions[key]]
+
+    def _ensure_all_seasons(self, collection: str, partitions: Dict[int, list], model: type):
+        """
+        Reads every season of ``collection`` missing from ``partitions``, once.  Callers that
+        only need the partitions filled use this instead of building the combined list.
+        """
+        if collection in self._fully_loaded:
+            return
+        with self._cache_lock:
+            if collection not in self._fully_loaded:
+                self._load_all_seasons(collection, partitions, model)
+
+    def _load_all_seasons(self, collection: str, partitions: Dict[int, list], model: type):
+        """ Reads every season of ``collection`` missing from ``partitions``, under the lock """
+        loaded: Dict[int, list] = {}
+        with self._measure(f'load_{collection}'):
+            for document in self.mongodb[collection].find(
+                    {'season': {'$nin': list(partitions)}}, batch_size=100000):
+                loaded.setdefault(document['season'], []).append(
+                    self._materialize(model, document))
+        # each partition shows up whole, never while it is being filled
+        partitions.update(loaded)
+        self._fully_loaded.add(collection)
+
+    def _materialize(self, model: type, document: dict) -> TGFPModel:
+        """
+        The live object for ``document``: the one this TGFP already holds for its ``_id``,
+        so every lookup and load hands out the same object, or a new ``model`` for it.
+        An object already held is kept as is, saves and ``apply_change`` keep it current.
+        """
+        # pylint: disable=protected-access
+        identity = self._identity.setdefault(model._COLLECTION, {})
+        live = identity.get(document['_id'])
+        if live is None:
+            live = model._loaded(self, document)
+            identity[document['_id']] = live
+        return live
+
+    def _write_through(
+            self, model: TGFPModel, fields: dict, document_id, inserted: bool):
+        """
+        Brings the caches in line with a write of ``fields`` to ``model``: a new model gets
+        ``document_id``, the ``_id`` of the document written, it (or a model built with an
+        ``_id`` whose save created the document) joins the identity map and the loaded list
+        it belongs to, and the lookup indexes on changed key fields are dropped.
+        Saving a second object for a document that already has a live one copies the saved
+        fields into the live one.  ``inserted`` when the write created the document.
+        """
+        # pylint: disable=protected-access
+        collection = model._COLLECTION
+        new_object = model._id is None
+        if new_object:
+            model._id = document_id
+        with self._cache_lock:
+            identity = self._identity.setdefault(collection, {})
+            live = identity.get(model._id)
+            # objects from iter_picks / iter_games aren't cached and don't join the map, new
+            # ones and those whose save created the document do
+            joins = live is None and (new_object or inserted)
+            if joins:
+                identity[model._id] = live = model
+            elif live is None:
+                live = model
+            if live is not model:
+                live.refresh(model)
+            elif joins:
+                loaded = self._loaded_lists(
+                    collection, getattr(model, 'season', None), create=True)
+                if loaded:
+                    loaded[0].append(model)
+                for key in [key for key in self._query_cache if key[0] == collection]:
+                    del self._query_cache[key]
+            if joins or live is not model or set(fields) & set(model._KEY_FIELDS):
+                self._drop_indexes(collection)
+        model._saved(inserted)
+
+    def _drop_indexes(self, collection: str):
+        """ Drops the lookup indexes over ``collection``, they are rebuilt on next use """
+        for name in list(self._indexes):
+            if (name[0] if isinstance(name, tuple) else name).startswith(collection):
+                del self._indexes[name]
+
+    def _iter(
+            self,
+            model: type,
+            query: dict,
+            projection: Optional[Iterable[str]],
+            batch_size: int,
+            ordered: bool) -> Iterator:
+        """
+        Streams ``model`` objects for ``query`` from a server side cursor, without caching
+        them or interning their ids, ``batch_size`` documents per round trip
+        """
+        # pylint: disable=protected-access
+        fields = None if projection is None else {field: 1 for field in projection}
+        cursor = self.mongodb[model._COLLECTION].find(query, fields, batch_size=batch_size)
+        if ordered:
+            cursor.sort([('season', 1), ('week_no', 1)])
+        try:
+            for document in cursor:
+                yield model._streamed(self, document)
+        finally:
+            cursor.close()
+
+    def iter_picks(
+            self,
+            season: Optional[int] = None,
+            week_no: Optional[int] = None,
+            player_id: Optional[ObjectId] = None,
+            projection: Optional[Iterable[str]] = None,
+            batch_size: int = 1000,
+            *,
+            ordered: bool = False) -> Iterator[TGFPPick]:
+        # pylint: disable=too-many-arguments
+        """
+        Streams the picks matching the filters, of every season when ``season`` is None, for
+        batch jobs.  The picks aren't added to the cache and their ids aren't interned, so
+        memory stays flat however many seasons are read as long as the caller doesn't keep
+        them.
+        Args:
+            projection: names of the fields to read, the other fields of the picks are left
+              unset (meant for reading, only save picks read whole)
+            batch_size: documents fetched per round trip
+            ordered: True to stream by season then week, served by the (season, week_no)
+              index from :meth:`ensure_indexes`, otherwise in the server's natural order
+        """
+        query = {
+            field: value
+            for field, value in (('season', season), ('week_no', week_no), ('player_id', player_id))
+            if value is not None
+        }
+        return self._iter(TGFPPick, query, projection, batch_size, ordered)
+
+    def iter_games(
+            self,
+            season: Optional[int] = None,
+            week_no: Optional[int] = None,
+            projection: Optional[Iterable[str]] = None,
+            batch_size: int = 1000,
+            *,
+            ordered: bool = False) -> Iterator[TGFPGame]:
+        """ Streams the games matching the filters, the same way as :meth:`iter_picks` """
+        query = {
+            field: value
+            for field, value in (('season', season), ('week_no', week_no))
+            if value is not None
+        }
+        return self._iter(TGFPGame, query, projection, batch_size, ordered)
+
+    def _index(self, name: Hashable, items: list, key: Callable, multi: bool = False) -> dict:
+        """
+        Returns the hash index ``name`` mapping ``key(item)`` to the list of matching items.
+        With ``multi`` ``key`` returns several keys and the item is filed under each of them.
+
+        Indexes are built once per cached list and rebuilt only when that list is replaced or
+        grows, each bucket keeps the cache order so filtered results come back as before.
+        """
+        cached = self._indexes.get(name)
+        if cached is None or cached[0] is not items or cached[1] != len(items):
+            with self._cache_lock:
+                cached = self._indexes.get(name)
+                if cached is None or cached[0] is not items or cached[1] != len(items):
+                    index: Dict = {}
+                    for item in items:
+                        for item_key in (key(item) if multi else (key(item),)):
+                            index.setdefault(item_key, []).append(item)
+                    cached = (items, len(items), index)
+                    self._indexes[name] = cached
+        return cached[2]
+
+    @staticmethod
+    def _filter_query(season: int, **filters) -> dict:
+        """ Mongo query for ``season`` plus each of the ``filters`` that was given """
+        query = {'season': season}
+        query.update({field: value for field, value in filters.items() if value})
+        return query
+
+    @staticmethod
+    def _query_key(collection: str, query: dict) -> tuple:
+        return collection, tuple(sorted(query.items()))
+
+    def _query(self, collection: str, query: dict, model: type, fields: tuple) -> list:
+        """
+        Runs ``query`` against ``collection`` projecting only ``fields``, caching the wrapped
+        model objects by query so repeated lookups don't go back to the database.
+        """
+        key = self._query_key(collection, query)
+        cached = self._query_cache.get(key)
+        if cached is None:
+            with self._cache_lock:
+                cached = self._query_cache.get(key)
+                if cached is None:
+                    projection = {field: 1 for field in fields}
+                    with self._measure(f'query_{collection}'):
+                        cached = [
+                            self._materialize(model, document)
+                            for document in self.mongodb[collection].find(query, projection)
+                        ]
+                    self._query_cache[key] = cached
+        return cached
+
+    @_instrumented('current_week')
     def current_week(self) -> int:
         """
         Gets the current week
 
         This is defined the current week.
         It will advance to the next week once all games are 'final'
+
+        The value is computed once and kept until a game's status changes through
+        ``TGFPGame.save()``, see :meth:`invalidate_current_week`
         """
-        last_game: TGFPGame
+        if 'current_week' not in self._week_cache:
+            self._week_cache['current_week'] = self._compute_current_week()
+        return self._week_cache['current_week']
+
+    def _last_weeks_games(self) -> List[TGFPGame]:
+        """ Returns the games of the latest week of the current season """
+        season_games: List[TGFPGame] = self.find_games()
+        if not season_games:
+            return []
+        return self.find_games(week_no=max(game.week_no for game in season_games))
+
+    def _compute_current_week(self) -> int:
         current_week: int
-        last_game_list: List[TGFPGame] = self.find_games(ordered_by='week_no')
-        if not last_game_list:
+        if not self.find_games():
             return 1  # First week
-        last_game = last_game_list[-1]
-        last_weeks_games = self.find_games(week_no=last_game.week_no)
+        last_weeks_games = self._last_weeks_games()
         all_games_completed = True
         game: Optional[TGFPGame] = None
         for game in last_weeks_games:
@@ -132,28 +568,55 @@ class TGFP:
 
     @property
     def seasons(self) -> List[int]:
-        seasons: List[int] = []
-        for season in self.mongodb.games.distinct("season"):
-            seasons.append(int(season))
-        return seasons
-
+        if self._seasons is None:
+            seasons: List[int] = []
+            for season in self.mongodb.games.distinct("season"):
+                seasons.append(int(season))
+            self._seasons = seasons
+        return list(self._seasons)
+
+    def invalidate_seasons(self):
+        """ Forgets the cached list of seasons, so it's read again on next use """
+        self._seasons = None
+
+    def pick_history(self, player_id: ObjectId) -> List[TGFPPick]:
+        """
+        Every pick of ``player_id`` over all seasons, ordered by season and week.  Served from
+        the per season player indexes, so after the picks are loaded (one read for all the
+        seasons not cached yet) it costs the player's own picks, not everybody's.
+        """
+        if self._query_mode:
+            history = self._query('picks', {'player_id': player_id}, TGFPPick, PICK_FIELDS)
+            return sorted(history, key=lambda pick: (pick.season, pick.week_no))
+        self._ensure_all_seasons('picks', self._picks, TGFPPick)
+        history = []
+        for season in sorted(self._picks):
+            player_picks = self._index(
+                ('picks_by_player', season), self._picks[season], lambda x: x.player_id
+            ).get(player_id, [])
+            history.extend(sorted(player_picks, key=lambda pick: pick.week_no))
+        return history
+
+    @_instrumented('current_active_week')
     def current_active_week(self) -> int:
         """
         Gets the currently 'active' week
 
         This is defined the most recent week when at least one game has been marked as 'final'.
         It is used for the purposes of showing the 'last wins, losses, etc...' on the standings
-        page.
+        page.  Cached the same way as :meth:`current_week`
         Return:
             int: current_active_week
         """
-        last_game: TGFPGame
+        if 'current_active_week' not in self._week_cache:
+            self._week_cache['current_active_week'] = self._compute_current_active_week()
+        return self._week_cache['current_active_week']
+
+    def _compute_current_active_week(self) -> int:
         current_week: int
-        last_game_list: List[TGFPGame] = self.find_games(ordered_by='week_no')
-        if not last_game_list:
+        if not self.find_games():
             return 1
-        last_game = last_game_list[-1]
-        last_weeks_games = self.find_games(week_no=last_game.week_no)
+        last_weeks_games = self._last_weeks_games()
         any_games_completed = False
         game: Optional[TGFPGame] = None
         for game in last_weeks_games:
@@ -169,6 +632,572 @@ class TGFP:
 
         return current_week
 
+    def invalidate_current_week(self):
+        """
+        Forgets the cached current / current active week so they are recomputed, call this
+        after changing game statuses or replacing the games cache by hand
+        """
+        self._week_cache.clear()
+
+    def standings(self, season: Optional[int] = None) -> TGFPStandings:
+        """
+        Returns the standings table for ``season`` (default: current season), computing it from
+        the season's picks the first time it is needed.
+        """
+        if not season:
+            season = self.current_season()
+        if season not in self._standings:
+            self._standings[season] = TGFPStandings(season, self.find_picks(season=season))
+        return self._standings[season]
+
+    def standings_matrix(self, season: Optional[int] = None) -> TGFPStandingsMatrix:
+        """
+        Returns the players x weeks NumPy standings matrices for ``season`` (default: current
+        season).  Requires the optional ``numpy`` dependency (the ``matrix`` extra).
+        """
+        if not season:
+            season = self.current_season()
+        if season not in self._standings_matrices:
+            self._standings_matrices[season] = TGFPStandingsMatrix(
+                season, self.find_picks(season=season)
+            )
+        return self._standings_matrices[season]
+
+    @staticmethod
+    def _standings_pipeline(
+            season: int,
+            active_week: Optional[int] = None,
+            week_no: Optional[int] = None,
+            by_week: bool = False) -> List[dict]:
+        """ Aggregation pipeline behind :meth:`aggregate_standings` """
+        match: dict = {'season': season}
+        if week_no is not None:
+            match['week_no'] = week_no
+        group: dict = {
+            '_id': {'player_id': '$player_id', 'week_no': '$week_no'} if by_week else '$player_id',
+            'wins': {'$sum': '$wins'},
+            'losses': {'$sum': '$losses'},
+            'bonus': {'$sum': '$bonus'},
+        }
+        project: dict = {
+            '_id': 0,
+            'player_id': '$_id.player_id' if by_week else '$_id',
+            'first_name': '$player.first_name',
+            'last_name': '$player.last_name',
+            'nick_name': '$player.nick_name',
+            'wins': 1,
+            'losses': 1,
+            'bonus': 1,
+            'total_points': {'$add': ['$wins', '$bonus']},
+        }
+        if by_week:
+            project['week_no'] = '$_id.week_no'
+        if active_week is not None:
+            for stat in ('wins', 'losses', 'bonus'):
+                group[f'last_{stat}'] = {
+                    '$sum': {'$cond': [{'$eq': ['$week_no', active_week]}, f'${stat}', 0]}
+                }
+                project[f'last_{stat}'] = 1
+        return [
+            {'$match': match},
+            {'$group': group},
+            {'$lookup': {
+                'from': 'players',
+                'localField': '_id.player_id' if by_week else '_id',
+                'foreignField': '_id',
+                'as': 'player'
+            }},
+            {'$unwind': {'path': '$player', 'preserveNullAndEmptyArrays': True}},
+            {'$project': project},
+            {'$sort': {'week_no': 1, 'total_points': -1} if by_week else {'total_points': -1}},
+        ]
+
+    def aggregate_standings(
+            self,
+            season: Optional[int] = None,
+            week_no: Optional[int] = None,
+            by_week: bool = False) -> List[dict]:
+        """
+        Computes the standings in mongo instead of from the cached picks, so only one row per
+        player (per week with ``by_week``) is read.  Nothing is cached.
+
+        Args:
+            season: default current season
+            week_no: only count this week
+            by_week: one row per player and week instead of season totals
+        Return:
+            List[dict]: best first, with ``player_id``, ``first_name``, ``last_name``,
+            ``nick_name``, ``wins``, ``losses``, ``bonus`` and ``total_points`` (plus ``week_no``
+            with ``by_week``, or ``last_wins`` / ``last_losses`` / ``last_bonus`` for the
+            current active week without it)
+        """
+        if not season:
+            season = self.current_season()
+        active_week = None if by_week else self.current_active_week()
+        pipeline = self._standings_pipeline(season, active_week, week_no, by_week)
+        return list(self.mongodb.picks.aggregate(pipeline))
+
+    def _clan_standings_by_clan(self, season: Optional[int] = None) -> Dict[int, TGFPClanStanding]:
+        """ Clan standings rows of ``season`` keyed by ``id()`` of their clan, cached """
+        if not season:
+            season = self.current_season()
+        active_week = self.current_active_week()
+        cached = self._clan_standings.get(season)
+        if cached is None or cached[0] != active_week:
+            standings = self.standings(season)
+            rows = {
+                id(clan): TGFPClanStanding(clan, standings, active_week) for clan in self.clans()
+            }
+            cached = (active_week, rows)
+            self._clan_standings[season] = cached
+        return cached[1]
+
+    def clan_standings(self, season: Optional[int] = None) -> List[TGFPClanStanding]:
+        """
+        Returns the clan leaderboard for ``season`` (default: current season), best total
+        points first, with every clan's wins / losses / bonus / last_* columns worked out once
+        from the players' standings.
+        """
+        return sorted(
+            self._clan_standings_by_clan(season).values(),
+            key=lambda row: row.total_points,
+            reverse=True
+        )
+
+    def clan_standing(self, clan: TGFPClan, season: Optional[int] = None) -> TGFPClanStanding:
+        """ Returns the standings row of ``clan``, rebuilt when its member list changed """
+        rows = self._clan_standings_by_clan(season)
+        row = rows.get(id(clan))
+        if row is None or row.members is not clan.members:
+            row = TGFPClanStanding(clan, self.standings(season), self.current_active_week())
+            if id(clan) in rows:
+                rows[id(clan)] = row
+        return row
+
+    def materialized_totals(self, season: Optional[int] = None) -> Dict[ObjectId, int]:
+        """ Total points per player id for ``season``, read from the ``standings`` collection """
+        if not season:
+            season = self.current_season()
+        if season not in self._materialized_totals:
+            self._materialized_totals[season] = {
+                row['_id']: row['points'] for row in self.mongodb.standings.aggregate([
+                    {'$match': {'season': season}},
+                    {'$group': {'_id': '$player_id', 'points': {'$sum': '$points'}}}
+                ])
+            }
+        return self._materialized_totals[season]
+
+    def rebuild_standings_collection(self, season: Optional[int] = None) -> List[tuple]:
+        """
+        Regenerates the ``standings`` collection for ``season`` (default: current season) from
+        the picks in the database, then checks it with :meth:`verify_standings_collection`
+        Return:
+            List[tuple]: the mismatches found, empty when the collection is consistent
+        """
+        if not season:
+            season = self.current_season()
+        documents = [
+            {
+                'season': season,
+                'player_id': row['_id']['player_id'],
+                'week_no': row['_id']['week_no'],
+                'wins': row['wins'],
+                'losses': row['losses'],
+                'bonus': row['bonus'],
+                'points': row['wins'] + row['bonus'],
+            }
+            for row in self.mongodb.picks.aggregate([
+                {'$match': {'season': season}},
+                {'$group': {
+                    '_id': {'player_id': '$player_id', 'week_no': '$week_no'},
+                    'wins': {'$sum': '$wins'},
+                    'losses': {'$sum': '$losses'},
+                    'bonus': {'$sum': '$bonus'},
+                }}
+            ])
+        ]
+        self.ensure_indexes(['standings'])
+        self.mongodb.standings.delete_many({'season': season})
+        if documents:
+            self.mongodb.standings.insert_many(documents)
+        self._materialized_totals.pop(season, None)
+        return self.verify_standings_collection(season)
+
+    def verify_standings_collection(self, season: Optional[int] = None) -> List[tuple]:
+        """
+        Compares the ``standings`` collection with the standings computed from the picks
+        Return:
+            List[tuple]: ``(player_id, week_no, stat, stored, computed)`` for every difference
+        """
+        if not season:
+            season = self.current_season()
+        standings = self.standings(season)
+        stored = {
+            (document['player_id'], document['week_no']): document
+            for document in self.mongodb.standings.find({'season': season})
+        }
+        keys = set(stored)
+        keys.update((pick.player_id, pick.week_no) for pick in self.find_picks(season=season))
+        mismatches = []
+        for player_id, week_no in keys:
+            document = stored.get((player_id, week_no), {})
+            for stat in STANDINGS_STATS:
+                computed = standings.for_week(player_id, stat, week_no)
+                if document.get(stat, 0) != computed:
+                    mismatches.append((player_id, week_no, stat, document.get(stat, 0), computed))
+        return mismatches
+
+    def ensure_indexes(self, collections: Optional[Iterable[str]] = None) -> Dict[str, List[str]]:
+        """
+        Creates the indexes declared in ``INDEXES`` for ``collections`` (default: all of them),
+        indexes that already exist are left alone.  Fails when a unique index can't be built
+        because the collection holds duplicates, or an index with the same keys and other
+        options exists.
+        Return:
+            Dict[str, List[str]]: the names of the declared indexes of each collection
+        """
+        # pylint: disable=import-outside-toplevel
+        from pymongo import IndexModel
+
+        names: Dict[str, List[str]] = {}
+        for collection in collections or INDEXES:
+            names[collection] = self.mongodb[collection].create_indexes(
+                [IndexModel(keys, **options) for keys, options in INDEXES[collection]]
+            )
+        return names
+
+    def _query_shapes(self, season: int) -> List[dict]:
+        """
+        An explainable command for each query shape the library sends, filled in with values
+        from ``season``.  The standings aggregation starts with the picks ``season`` /
+        ``week_no`` match, and saves of teams, players and clans filter on _id only.
+        """
+        game = self.mongodb.games.find_one({'season': season}) or {}
+        pick = self.mongodb.picks.find_one({'season': season}) or {}
+        filters = [
+            ('games', {'season': season}),
+            ('games', {'season': season, 'week_no': game.get('week_no')}),
+            ('games', {'season': season, 'home_team_id': game.get('home_team_id')}),
+            ('games', {'tgfp_nfl_game_id': game.get('tgfp_nfl_game_id')}),
+            ('picks', {'season': season}),
+            ('picks', {'season': season, 'week_no': pick.get('week_no')}),
+            ('picks', {'season': season, 'player_id': pick.get('player_id')}),
+            ('picks', {'player_id': pick.get('player_id')}),
+            ('picks', {
+                'player_id': pick.get('player_id'), 'week_no': pick.get('week_no'), 'season': season
+            }),
+            ('standings', {'season': season}),
+        ]
+        commands = [{'find': collection, 'filter': query} for collection, query in filters]
+        # the polling cache watcher
+        commands.extend(
+            {
+                'find': collection,
+                'filter': {'updated_at': {'$gte': datetime.now(timezone.utc)}},
+                'sort': {'updated_at': 1}
+            }
+            for collection in ('teams', 'players', 'clans', 'games', 'picks')
+        )
+        commands.append({'distinct': 'games', 'key': 'season', 'query': {}})
+        return commands
+
+    @staticmethod
+    def _collection_scans(explained) -> List[str]:
+        """ The namespaces of the COLLSCAN stages anywhere in an ``explain`` result """
+        scans: List[str] = []
+        if isinstance(explained, dict):
+            if explained.get('stage') == 'COLLSCAN':
+                scans.append(explained.get('namespace', ''))
+            for value in explained.values():
+                scans.extend(TGFP._collection_scans(value))
+        elif isinstance(explained, list):
+            for value in explained:
+                scans.extend(TGFP._collection_scans(value))
+        return scans
+
+    def diagnose_query_plans(self, season: Optional[int] = None) -> List[tuple]:
+        """
+        Runs ``explain`` on every query shape the library issues (for ``season``, default:
+        current season) and reports those the planner answers with a collection scan, run it
+        after :meth:`ensure_indexes` or a schema change to catch missing indexes early
+        Return:
+            List[tuple]: (collection, command) of each shape whose plan has a COLLSCAN
+        """
+        if not season:
+            season = self.current_season()
+        scans = []
+        for command in self._query_shapes(season):
+            explained = self.mongodb.command('explain', command, verbosity='queryPlanner')
+            winning_plan = explained.get('queryPlanner', {}).get('winningPlan', explained)
+            if self._collection_scans(winning_plan):
+                collection = command.get('find') or command.get('distinct')
+                scans.append((collection, command))
+        return scans
+
+    def _tracks_standings(self, collection: str) -> bool:
+        """ True when writes to ``collection`` have to be carried into the standings """
+        return self._materialized_standings and collection == 'picks'
+
+    def _stored_projection(self, collection: str) -> dict:
+        """ The fields a save reads back from the document it overwrites """
+        if self._tracks_standings(collection):
+            return dict.fromkeys(('_id',) + STANDINGS_KEY + STANDINGS_STATS[:3], 1)
+        return {'_id': 1}
+
+    def _standings_increments(
+            self, collection: str, query: dict, fields: dict, stored: Optional[dict]
+    ) -> List[tuple]:
+        """
+        ``(filter, {'$inc': ...})`` updates carrying a write of ``fields`` to the pick
+        matched by ``query`` into the materialized standings collection.  The deltas are
+        taken from ``stored``, the document before the write (None when it inserted), not
+        from the model, so a save matching a pick another object already stored only adds
+        what actually changed.
+        """
+        if not self._tracks_standings(collection):
+            return []
+        stored = stored or {}
+        wins, losses, bonus = (
+            fields.get(stat, stored.get(stat, 0)) - stored.get(stat, 0)
+            for stat in ('wins', 'losses', 'bonus')
+        )
+        if not (wins or losses or bonus):
+            return []
+        return [(
+            {field: query[field] for field in STANDINGS_KEY},
+            {'$inc': {'wins': wins, 'losses': losses, 'bonus': bonus, 'points': wins + bonus}}
+        )]
+
+    def _stored_picks(self, saves: List[tuple]) -> Dict[tuple, dict]:
+        """
+        The stored stats of the picks matched by the ``(model, filter, fields, upsert)``
+        saves of a flush, keyed by (season, player_id, week_no), in one query
+        """
+        cursor = self.mongodb.picks.find(
+            {'$or': [query for _, query, _, _ in saves]}, self._stored_projection('picks')
+        )
+        return {tuple(document[field] for field in STANDINGS_KEY): document for document in cursor}
+
+    def _write_standings_increments(self, increments: List[tuple]):
+        if not increments:
+            return
+        self.mongodb.standings.bulk_write(self._standings_requests(increments))
+        self._standings_written(increments)
+
+    @staticmethod
+    def _standings_requests(increments: List[tuple]) -> list:
+        """ The ``bulk_write`` requests applying ``increments`` to the standings collection """
+        # pylint: disable=import-outside-toplevel
+        from pymongo import UpdateOne
+
+        return [UpdateOne(query, update, upsert=True) for query, update in increments]
+
+    def _standings_written(self, increments: List[tuple]):
+        """ Drops the materialized totals ``increments`` made stale """
+        for query, _ in increments:
+            self._materialized_totals.pop(query['season'], None)
+
+    def invalidate_clan_standings(self):
+        """ Drops the clan standings so they are rebuilt on next use """
+        self._clan_standings.clear()
+
+    def rescore_week(self, season: int, week_no: int) -> int:
+        """
+        Rescores every pick of ``week_no`` in ``season`` against a single game lookup and
+        writes the picks whose record changed back with one ``bulk_write``.
+        Return:
+            int: the number of picks that were updated
+        """
+        games_by_id: Dict[ObjectId, TGFPGame] = {
+            game.id: game for game in self.find_games(week_no=week_no, season=season)
+        }
+        updated: int = 0
+        pick: TGFPPick
+        with self.unit_of_work(ordered=False):
+            for pick in self.find_picks(week_no=week_no, season=season):
+                pick.load_record(games=games_by_id)
+                if pick.changed_data():
+                    updated += 1
+                    pick.save()
+        return updated
+
+    def _picks_for_game(self, game: TGFPGame) -> List[TGFPPick]:
+        """
+        The picks ``game`` can score: those with the game in their pick_detail, or with one
+        of its teams as their lock / upset pick that week
+        """
+        teams = (game.home_team_id, game.road_team_id)
+        if self._query_mode:
+            return [
+                pick for pick in self.find_picks(week_no=game.week_no, season=game.season)
+                if game.id in pick.pick_detail.game_ids
+                or pick.lock_team_id in teams or pick.upset_team_id in teams
+            ]
+        season_picks = self.picks(game.season)
+        by_game = self._index(
+            ('picks_by_game', game.season), season_picks,
+            lambda pick: pick.pick_detail.game_ids, multi=True
+        )
+        by_team = self._index(
+            ('picks_by_bonus_team', game.season), season_picks,
+            lambda pick: ((pick.week_no, pick.lock_team_id), (pick.week_no, pick.upset_team_id)),
+            multi=True
+        )
+        picks = dict.fromkeys(by_game.get(game.id, []))
+        for team_id in teams:
+            picks.update(dict.fromkeys(by_team.get((game.week_no, team_id), [])))
+        return list(picks)
+
+    def rescore_game(self, game: TGFPGame) -> List[TGFPPick]:
+        """
+        Rescores only the picks ``game`` can score (see :meth:`_picks_for_game`), saves the
+        ones whose record changed and hands them to the :meth:`subscribe` callbacks.  Called
+        by ``TGFPGame.save()`` when a game becomes final, stops being final or has its final
+        score corrected.
+        Return:
+            List[TGFPPick]: the picks whose record changed
+        """
+        changed = self._rescore(game, self._picks_for_game(game))
+        with self.unit_of_work(ordered=False):
+            for pick in changed:
+                pick.save()
+        self._notify_rescored(game, changed)
+        return changed
+
+    def _rescore(self, game: TGFPGame, picks: List[TGFPPick]) -> List[TGFPPick]:
+        """ Reloads the records of ``picks`` after ``game`` changed, returns the changed ones """
+        if not picks:
+            return []
+        games_by_id: Dict[ObjectId, TGFPGame] = {
+            week_game.id: week_game
+            for week_game in self.find_games(week_no=game.week_no, season=game.season)
+        }
+        # the saved instance wins over a stale cached copy of the same game
+        games_by_id[game.id] = game
+        changed: List[TGFPPick] = []
+        pick: TGFPPick
+        for pick in picks:
+            pick.load_record(games=games_by_id)
+            if pick.changed_data():
+                changed.append(pick)
+        return changed
+
+    def _notify_rescored(self, game: TGFPGame, picks: List[TGFPPick]):
+        if picks:
+            for callback in list(self._subscribers):
+                callback(game, picks)
+
+    def subscribe(self, callback: Callable[[TGFPGame, List[TGFPPick]], None]):
+        """
+        Calls ``callback(game, picks)`` whenever saving ``game`` rescored ``picks``, e.g. to
+        refresh a standings page or post to discord.  The season's standings are already
+        invalidated at that point.
+        """
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[TGFPGame, List[TGFPPick]], None]):
+        self._subscribers.remove(callback)
+
+    def invalidate_standings(self, season: int):
+        """ Drops the standings tables for ``season`` so they are rebuilt on next use """
+        self._standings.pop(season, None)
+        self._standings_matrices.pop(season, None)
+        self._clan_standings.pop(season, None)
+        self._materialized_totals.pop(season, None)
+
+    def _loaded_lists(
+            self, collection: str, season: Optional[int] = None, create: bool = False
+    ) -> List[list]:
+        """
+        The cached lists holding ``collection`` objects: that of ``season`` (every loaded
+        season when None) for games and picks, the whole collection otherwise.  With
+        ``create`` a season the fully loaded games / picks have no partition for yet (its
+        first document is being added) gets an empty one.
+        """
+        if collection in ('games', 'picks'):
+            partitions = self._games if collection == 'games' else self._picks
+            if season is None:
+                return list(partitions.values())
+            if season not in partitions and create and collection in self._fully_loaded:
+                partitions[season] = []
+            return [partitions[season]] if season in partitions else []
+        items = {'teams': self._teams, 'players': self._players, 'clans': self._clans}[collection]
+        # these are read on first use when empty
+        return [items] if items else []
+
+    def _invalidate_changed(
+            self, collection: str, season: Optional[int], cached: Optional[TGFPModel]):
+        """ Drops what ``apply_change`` of ``collection`` makes stale besides the object """
+        # pylint: disable=protected-access
+        if collection == 'games':
+            self.invalidate_current_week()
+            self.invalidate_seasons()
+        elif collection == 'picks':
+            for changed_season in {season, getattr(cached, 'season', None)} - {None}:
+                self.invalidate_standings(changed_season)
+            for player in self._players:
+                if player.id == getattr(cached, 'player_id', None):
+                    player._pick_history = None
+        elif collection in ('players', 'clans'):
+            self.invalidate_clan_standings()
+
+    def apply_change(
+            self,
+            collection: str,
+            operation: str,
+            document_id: ObjectId,
+            document: Optional[dict] = None) -> bool:
+        """
+        Applies an insert / update / replace / delete of a ``collection`` document, made by
+        another process, to the cached objects.  A cached object is updated in place (see
+        :meth:`TGFPModel.refresh`) so the references callers hold stay current, a new
+        document is added to the loaded list it belongs to and a deleted one removed from it.
+        The caches derived from the collection (indexes, standings, weeks) are dropped.
+        Used by ``tgfp_lib.watcher.TGFPCacheWatcher``.
+        Args:
+            collection: 'teams', 'players', 'clans', 'games' or 'picks'
+            operation: 'insert', 'update', 'replace' or 'delete'
+            document_id: _id of the changed document
+            document: the whole document after the change, None for deletes
+        Return:
+            bool: True when a cached object was added, changed or removed
+        """
+        # pylint: disable=protected-access
+        with self._cache_lock:
+            model = {
+                'teams': TGFPTeam,
+                'players': TGFPPlayer,
+                'clans': TGFPClan,
+                'games': TGFPGame,
+                'picks': TGFPPick
+            }[collection]
+            for key in [key for key in self._query_cache if key[0] == collection]:
+                del self._query_cache[key]
+            season = document.get('season') if document else None
+            identity = self._identity.setdefault(collection, {})
+            cached: Optional[TGFPModel] = identity.get(document_id)
+            if operation == 'delete':
+                if cached is not None:
+                    del identity[document_id]
+                    for items in self._loaded_lists(collection, getattr(cached, 'season', None)):
+                        for position, item in enumerate(items):
+                            if item is cached:
+                                del items[position]
+                                break
+            elif cached is not None:
+                cached.refresh(model._loaded(self, document))
+            else:
+                loaded = self._loaded_lists(collection, season, create=True)
+                if loaded:
+                    cached = self._materialize(model, document)
+                    loaded[0].append(cached)
+
+            self._invalidate_changed(collection, season, cached)
+            if cached is None:
+                return False
+            self._indexes.clear()
+            return True
+
     def home_page_text(self):
         """ Returns the text of the home page """
         if not self._home_page_text:
@@ -176,6 +1205,7 @@ class TGFP:
             self._home_page_text = tgfp_info['home_page_text']
         return self._home_page_text
 
+    @_instrumented('find_players')
     def find_players(
             self,
             player_id=None,
@@ -185,7 +1215,7 @@ class TGFP:
             player_full_name=None,
             ordered_by=None,
             reverse_order=False) -> List[TGFPPlayer]:
-        # pylint: disable=too-many-arguments
+        # pylint: disable=too-many-arguments,too-many-branches
         """
         Returns a list of players based on the search criteria
         Args:
@@ -197,8 +1227,19 @@ class TGFP:
         """
 
         found_players = []
+        players: List[TGFPPlayer] = self.players()
+        if player_id is not None:
+            candidates = self._index('players_by_id', players, lambda x: x.id).get(player_id, [])
+        elif discord_id is not None:
+            candidates = self._index(
+                'players_by_discord_id', players, lambda x: x.discord_id).get(discord_id, [])
+        elif player_email is not None:
+            candidates = self._index(
+                'players_by_email', players, lambda x: x.email).get(player_email, [])
+        else:
+            candidates = players
         player: TGFPPlayer
-        for player in self.players():
+        for player in candidates:
             found = True
             if player_id is not None and player_id != player.id:
                 found = False
@@ -212,11 +1253,15 @@ class TGFP:
                 found = False
             if found:
                 found_players.append(player)
-        if ordered_by == "total_points":
+        if ordered_by == "total_points" and self._materialized_standings:
+            totals = self.materialized_totals()
+            found_players.sort(key=lambda x: totals.get(x.id, 0), reverse=reverse_order)
+        elif ordered_by == "total_points":
             found_players.sort(key=lambda x: x.total_points(), reverse=reverse_order)
 
         return found_players
 
+    @_instrumented('find_teams')
     def find_teams(
             self,
             team_id=None,
@@ -225,8 +1270,16 @@ class TGFP:
     ) -> List[TGFPTeam]:
         """ find a list of TGFPTeams given input filter team_id and or tgfp_nfl_team_id """
         found_teams = []
+        teams: List[TGFPTeam] = self.teams()
+        if team_id:
+            candidates = self._index('teams_by_id', teams, lambda x: x.id).get(team_id, [])
+        elif tgfp_nfl_team_id:
+            candidates = self._index(
+                'teams_by_nfl_id', teams, lambda x: x.tgfp_nfl_team_id).get(tgfp_nfl_team_id, [])
+        else:
+            candidates = teams
         team: TGFPTeam
-        for team in self.teams():
+        for team in candidates:
             found = True
             if team_id and team_id != team.id:
                 found = False
@@ -239,6 +1292,7 @@ class TGFP:
 
         return found_teams
 
+    @_instrumented('find_clan')
     def find_clan(self,
                   clan_id=None,
                   clan_name=None,
@@ -260,6 +1314,7 @@ class TGFP:
 
         return found_clan
 
+    @_instrumented('find_picks')
     def find_picks(
             self,
             pick_id=None,
@@ -268,14 +1323,34 @@ class TGFP:
             player_id=None
     ) -> List[TGFPPick]:
         """ Find a list of TGFPPicks """
+        # pylint: disable=too-many-branches
         found_picks = []
         if season:
             search_season = season
         else:
             search_season = self.current_season()
 
+        if self._query_mode:
+            query = self._filter_query(
+                search_season, _id=pick_id, week_no=week_no, player_id=player_id)
+            candidates = self._query('picks', query, TGFPPick, PICK_FIELDS)
+        elif pick_id:
+            candidates = self._index(
+                ('picks_by_id', search_season), self.picks(search_season), lambda x: x.id
+            ).get(pick_id, [])
+        elif player_id:
+            candidates = self._index(
+                ('picks_by_player', search_season), self.picks(search_season),
+                lambda x: x.player_id
+            ).get(player_id, [])
+        elif week_no:
+            candidates = self._index(
+                ('picks_by_week', search_season), self.picks(search_season), lambda x: x.week_no
+            ).get(week_no, [])
+        else:
+            candidates = self.picks(search_season)
         pick: TGFPPick
-        for pick in self.picks():
+        for pick in candidates:
             found = True
             if pick_id and pick_id != pick.id:
                 found = False
@@ -290,6 +1365,7 @@ class TGFP:
 
         return found_picks
 
+    @_instrumented('find_games')
     def find_games(
             self,
             game_id=None,
@@ -300,14 +1376,39 @@ class TGFP:
             ordered_by=None) -> List[TGFPGame]:
         """ Find list of games """
         # pylint: disable=too-many-arguments
+        # pylint: disable=too-many-branches
 
         found_games = []
         if season:
             search_season = season
         else:
             search_season = self.current_season()
+        if self._query_mode:
+            query = self._filter_query(
+                search_season,
+                _id=game_id,
+                tgfp_nfl_game_id=tgfp_nfl_game_id,
+                week_no=week_no,
+                home_team_id=home_team_id
+            )
+            candidates = self._query('games', query, TGFPGame, GAME_FIELDS)
+        elif game_id:
+            candidates = self._index(
+                ('games_by_id', search_season), self.games(search_season), lambda x: x.id
+            ).get(game_id, [])
+        elif tgfp_nfl_game_id:
+            candidates = self._index(
+                ('games_by_nfl_id', search_season), self.games(search_season),
+                lambda x: x.tgfp_nfl_game_id
+            ).get(tgfp_nfl_game_id, [])
+        elif week_no:
+            candidates = self._index(
+                ('games_by_week', search_season), self.games(search_season), lambda x: x.week_no
+            ).get(week_no, [])
+        else:
+            candidates = self.games(search_season)
         game: TGFPGame
-        for game in self.games():
+        for game in candidates:
             found = True
             if game_id and game_id != game.id:
                 found = False
@@ -329,18 +1430,656 @@ class TGFP:
 
         return found_games
 
+    @contextmanager
+    def unit_of_work(self, ordered: bool = True) -> Iterator[TGFPUnitOfWork]:
+        """
+        Collects every model ``save()`` made inside the ``with`` block and writes them when
+        the block exits, as one ``bulk_write`` per collection.  Nothing is written if the
+        block raises, and the queued models are left with their unsaved changes.  A nested
+        ``unit_of_work`` joins the one already open.
+
+        Example::
+
+            with tgfp.unit_of_work(ordered=False):
+                for team in tgfp.teams():
+                    team.wins = ...
+                    team.save()
+        """
+        current = self._current_unit_of_work()
+        if current is not None:
+            yield current
+            return
+        unit_of_work = TGFPUnitOfWork(self, ordered=ordered)
+        token = _open_units_of_work.set(
+            _open_units_of_work.get() + ((self._identity, unit_of_work),)
+        )
+        try:
+            yield unit_of_work
+            unit_of_work.flush()
+        except BaseException:
+            unit_of_work.discard()
+            raise
+        finally:
+            _open_units_of_work.reset(token)
+
+    def _current_unit_of_work(self) -> Optional[TGFPUnitOfWork]:
+        """ The unit of work this thread / task opened on this TGFP or one of its views """
+        for identity, unit_of_work in _open_units_of_work.get():
+            if identity is self._identity:
+                return unit_of_work
+        return None
+
+    @_instrumented('save')
+    def save_model(self, model):
+        """
+        Writes ``model`` (any of the TGFP model classes) to its collection, or queues it when
+        a :meth:`unit_of_work` is open.  Only the changed fields are sent, and a model without
+        changes isn't written at all.  A new model gets its ``_id`` from the same round trip
+        and is added to the cached lists, so no reload is needed after saving.
+        """
+        # pylint: disable=import-outside-toplevel
+        from pymongo import ReturnDocument
+
+        write = self._save_write(model)
+        if write is None:
+            return
+        collection, query, update, projection, upsert = write
+        stored = self.mongodb[collection].find_one_and_update(
+            query, update, projection, upsert=upsert, return_document=ReturnDocument.BEFORE
+        )
+        self._write_standings_increments(self._save_written(model, write, stored))
+
+    def _save_write(self, model) -> Optional[tuple]:
+        """
+        The first half of a save shared by ``save_model`` and ``AsyncTGFP.asave_model``:
+        None when ``model`` has no changes or was queued into the open unit of work,
+        otherwise the ``(collection, filter, update, projection, upsert)`` of the
+        ``find_one_and_update`` writing it
+        """
+        # pylint: disable=protected-access
+        if not model.changed_data():
+            return None
+        unit_of_work = self._current_unit_of_work()
+        if unit_of_work is not None:
+            unit_of_work.add(model)
+            return None
+        collection, query, update, upsert = model._write_args()
+        if upsert and '_id' not in query:
+            # the document returned is the one before the write, an insert needs its id here
+            update['$setOnInsert'] = {'_id': ObjectId()}
+        return collection, query, update, self._stored_projection(collection), upsert
+
+    def _save_written(self, model, write: tuple, stored: Optional[dict]) -> List[tuple]:
+        """
+        The second half of a save, once ``write`` (from ``_save_write``) returned
+        ``stored``, the document before it: brings the caches in line and returns the
+        standings increments left to write
+        """
+        collection, query, update, _, upsert = write
+        model.mark_clean()
+        self._write_through(
+            model, update['$set'], self._written_id(query, update, stored),
+            inserted=upsert and stored is None)
+        return self._standings_increments(collection, query, update['$set'], stored)
+
+    @staticmethod
+    def _written_id(query: dict, update: dict, stored: Optional[dict]):
+        """ The ``_id`` of the document a save returning the document before it wrote to """
+        if stored is not None:
+            return stored['_id']
+        return update.get('$setOnInsert', query).get('_id')
+
+    def intern_id(self, object_id: ObjectId) -> ObjectId:
+        """
+        Returns the one shared instance of ``object_id``, so the thousands of game / team ids
+        repeated across cached picks don't each keep their own copy
+        """
+        return self._interned_ids.setdefault(object_id, object_id)
+
     @staticmethod
     def object_id_from_string(object_id_string: str) -> ObjectId:
         return ObjectId(object_id_string)
 
 
-class TGFPTeam:
+class TGFPUnitOfWork:
+    """
+    Pending model saves, grouped per collection and written with ``bulk_write`` on
+    :meth:`flush`.  Created through :meth:`TGFP.unit_of_work`.
+    """
+
+    def __init__(self, tgfp: TGFP, ordered: bool = True):
+        self._tgfp: TGFP = tgfp
+        self.ordered: bool = ordered
+        # collection -> {id(model): (model, filter, fields to $set, upsert)}
+        self._pending: Dict[str, Dict[int, tuple]] = {}
+        # id(model) -> (model, its changed fields when first queued), restored by discard()
+        self._snapshots: Dict[int, tuple] = {}
+
+    def __len__(self):
+        return sum(len(saves) for saves in self._pending.values())
+
+    def add(self, model):
+        """
+        Queues the changed fields of ``model`` to be written on the next flush, saving a
+        model again before the flush merges the new changes into the queued write
+        """
+        # pylint: disable=protected-access
+        collection, query, update, upsert = model._write_args()
+        saves = self._pending.setdefault(collection, {})
+        if id(model) in saves:
+            saves[id(model)][2].update(update['$set'])
+        else:
+            saves[id(model)] = (model, query, dict(update['$set']), upsert)
+        self._snapshots.setdefault(id(model), (model, dict(model._changed_from)))
+        model.mark_clean()
+
+    def discard(self):
+        """
+        Drops the pending saves and marks their models changed again, so nothing queued is
+        lost when the ``unit_of_work`` block (or its flush) raises
+        """
+        # pylint: disable=protected-access
+        for model, changed_from in self._snapshots.values():
+            # fields changed after the save keep their own original, the queued ones
+            # go back to the stored value
+            model._changed_from.update(changed_from)
+        self._pending = {}
+        self._snapshots = {}
+
+    def flush(self) -> Dict[str, BulkWriteResult]:
+        """
+        Writes all pending saves and hands every upserted id back to its model, updating the
+        caches the same way ``TGFP.save_model`` does
+        Return:
+            Dict[str, BulkWriteResult]: the bulk write result of each collection
+        """
+        # pylint: disable=protected-access,import-outside-toplevel
+        from pymongo import UpdateOne
+
+        results: Dict[str, BulkWriteResult] = {}
+        with self._tgfp._measure('flush'):
+            # the models' _saved hooks can queue more saves (a final game rescoring its
+            # picks), keep going until nothing is left
+            while self._pending:
+                pending, self._pending = self._pending, {}
+                increments = []
+                for collection, saves in pending.items():
+                    queued = list(saves.values())
+                    increments.extend(self._increments(collection, queued))
+                    result = self._tgfp.mongodb[collection].bulk_write(
+                        [
+                            UpdateOne(
+                                query,
+                                {"$set": fields, "$currentDate": {'updated_at': True}},
+                                upsert=upsert
+                            )
+                            for _, query, fields, upsert in queued
+                        ],
+                        ordered=self.ordered
+                    )
+                    for (model, _, fields, _), (document_id, inserted) in zip(
+                            queued, self._written_ids(collection, queued, result)):
+                        self._tgfp._write_through(model, fields, document_id, inserted)
+                    results[collection] = result
+                self._tgfp._write_standings_increments(increments)
+        self._snapshots = {}
+        return results
+
+    def _written_ids(
+            self, collection: str, queued: List[tuple], result: BulkWriteResult) -> List[tuple]:
+        """
+        ``(_id, inserted)`` of the document each queued save wrote.  The bulk result only
+        carries the ids it inserted, the new models whose upsert matched a stored document
+        are looked up together with one ``$or`` query.
+        """
+        # pylint: disable=protected-access
+        written = [
+            (result.upserted_ids[position], True) if position in result.upserted_ids
+            else (model._id, False)
+            for position, (model, _, _, _) in enumerate(queued)
+        ]
+        matched = [
+            query for (model, query, _, _), (document_id, _) in zip(queued, written)
+            if document_id is None
+        ]
+        if not matched:
+            return written
+        # the queued filters of a collection all use the same fields
+        fields = sorted(matched[0])
+        found = {
+            tuple(document.get(field) for field in fields): document['_id']
+            for document in self._tgfp.mongodb[collection].find(
+                {'$or': matched}, dict.fromkeys(['_id'] + fields, 1))
+        }
+        return [
+            (found.get(tuple(query[field] for field in fields)), False)
+            if document_id is None else (document_id, inserted)
+            for (_, query, _, _), (document_id, inserted) in zip(queued, written)
+        ]
+
+    def _increments(self, collection: str, queued: List[tuple]) -> List[tuple]:
+        """ The standings updates for the queued saves, from the picks as stored now """
+        # pylint: disable=protected-access
+        if not self._tgfp._tracks_standings(collection):
+            return []
+        stored = self._tgfp._stored_picks(queued)
+        increments = []
+        for _, query, fields, _ in queued:
+            key = tuple(query[field] for field in STANDINGS_KEY)
+            before = stored.get(key)
+            increments.extend(
+                self._tgfp._standings_increments(collection, query, fields, before))
+            # a second save of the same pick in this flush starts from this one
+            stored[key] = {**(before or {}), **fields}
+        return increments
+
+
+class TGFPStandings:
+    """
+    Standings table for a single season.
+
+    Holds per player, per week wins / losses / bonus / points along with their running totals,
+    so every 'for week' or 'through week' question is a list lookup instead of a walk over
+    the player's picks.
+    """
+
+    def __init__(self, season: int, picks: List[TGFPPick]):
+        self.season: int = season
+        self.last_week_no: int = max((pick.week_no for pick in picks), default=0)
+        self._weekly: Dict[ObjectId, Dict[str, List[int]]] = {}
+        pick: TGFPPick
+        for pick in picks:
+            weekly = self._weekly.get(pick.player_id)
+            if weekly is None:
+                weekly = {stat: [0] * (self.last_week_no + 1) for stat in STANDINGS_STATS}
+                self._weekly[pick.player_id] = weekly
+            weekly['wins'][pick.week_no] += pick.wins
+            weekly['losses'][pick.week_no] += pick.losses
+            weekly['bonus'][pick.week_no] += pick.bonus
+            weekly['points'][pick.week_no] += pick.wins + pick.bonus
+        self._cumulative: Dict[ObjectId, Dict[str, List[int]]] = {
+            player_id: {stat: list(accumulate(values)) for stat, values in weekly.items()}
+            for player_id, weekly in self._weekly.items()
+        }
+
+    @property
+    def player_ids(self) -> List[ObjectId]:
+        """ ids of every player with at least one pick this season """
+        return list(self._weekly)
+
+    def for_week(self, player_id: ObjectId, stat: str, week_no: int) -> int:
+        """ Returns ``stat`` for the player in week ``week_no`` only """
+        weekly = self._weekly.get(player_id)
+        if weekly is None or not 0 < week_no <= self.last_week_no:
+            return 0
+        return weekly[stat][week_no]
+
+    def through_week(self, player_id: ObjectId, stat: str, week_through=None) -> int:
+        """ Returns ``stat`` for the player summed through ``week_through`` (default: all) """
+        cumulative = self._cumulative.get(player_id)
+        if cumulative is None:
+            return 0
+        if week_through is None:
+            return cumulative[stat][-1]
+        if week_through <= 0:
+            return 0
+        return cumulative[stat][min(week_through, self.last_week_no)]
+
+
+class TGFPStandingsMatrix:
+    """
+    Whole league standings for a single season as players x weeks NumPy arrays.
+
+    Row ``i`` belongs to ``player_ids[i]`` and column ``j`` to week ``j + 1``.  ``wins``,
+    ``losses``, ``bonus`` and ``points`` hold the per week numbers, ``cumulative()``,
+    ``rank()`` and ``winning_pct()`` derive the season-to-date views from them.
+    """
+
+    def __init__(self, season: int, picks: List[TGFPPick]):
+        # numpy is an optional dependency, only needed for the matrix views
+        try:
+            # pylint: disable=import-outside-toplevel
+            import numpy as np
+        except ImportError as exc:
+            raise ImportError(
+                "TGFP.standings_matrix() requires numpy, install tgfp-lib[matrix]"
+            ) from exc
+
+        self.season: int = season
+        self.player_ids: List[ObjectId] = list(dict.fromkeys(pick.player_id for pick in picks))
+        self.last_week_no: int = max((pick.week_no for pick in picks), default=0)
+        self._np = np
+
+        rows = {player_id: row for row, player_id in enumerate(self.player_ids)}
+        records = np.array(
+            [(rows[pick.player_id], pick.week_no - 1, pick.wins, pick.losses, pick.bonus)
+             for pick in picks],
+            dtype=np.int64
+        ).reshape(-1, 5)
+        shape = (len(self.player_ids), self.last_week_no)
+        index = (records[:, 0], records[:, 1])
+        self.wins = np.zeros(shape, dtype=np.int64)
+        self.losses = np.zeros(shape, dtype=np.int64)
+        self.bonus = np.zeros(shape, dtype=np.int64)
+        np.add.at(self.wins, index, records[:, 2])
+        np.add.at(self.losses, index, records[:, 3])
+        np.add.at(self.bonus, index, records[:, 4])
+        self.points = self.wins + self.bonus
+
+    @property
+    def weeks(self):
+        """ week number of every column """
+        return self._np.arange(1, self.last_week_no + 1)
+
+    def row(self, player_id: ObjectId) -> int:
+        """ Returns the row index of ``player_id`` """
+        return self.player_ids.index(player_id)
+
+    def cumulative(self, stat: str = 'points'):
+        """ Returns ``stat`` summed season-to-date, column ``j`` is 'through week j + 1' """
+        assert stat in STANDINGS_STATS
+        return self._np.cumsum(getattr(self, stat), axis=1)
+
+    def _through(self, stat: str, week_through=None):
+        """ One season-to-date column of ``stat`` (default: through the last week) """
+        if week_through is None:
+            week_through = self.last_week_no
+        week_through = min(week_through, self.last_week_no)
+        if week_through <= 0:
+            return self._np.zeros(len(self.player_ids), dtype=self._np.int64)
+        return getattr(self, stat)[:, :week_through].sum(axis=1)
+
+    def rank(self, week_through=None):
+        """
+        Returns every player's place by points through ``week_through`` (default: all weeks),
+        1 being first and tied players sharing the better place.
+        """
+        points = self._through('points', week_through)
+        descending = self._np.sort(points)[::-1]
+        return self._np.searchsorted(-descending, -points, side='left') + 1
+
+    def winning_pct(self, week_through=None):
+        """ Returns every player's wins / (wins + losses) through ``week_through`` """
+        wins = self._through('wins', week_through).astype(float)
+        decided = wins + self._through('losses', week_through)
+        pct = self._np.zeros(len(self.player_ids), dtype=float)
+        self._np.divide(wins, decided, out=pct, where=decided > 0)
+        return pct
+
+
+class TGFPClanStanding:
+    """
+    One row of the clan leaderboard: the clan's members' standings summed up
+    """
+    __slots__ = (
+        'clan', 'members', 'wins', 'losses', 'bonus', 'last_wins', 'last_losses', 'last_bonus'
+    )
+
+    def __init__(self, clan: TGFPClan, standings: TGFPStandings, active_week: int):
+        self.clan: TGFPClan = clan
+        self.members: List[TGFPPlayer] = clan.members
+        self.wins: int = 0
+        self.losses: int = 0
+        self.bonus: int = 0
+        self.last_wins: int = 0
+        self.last_losses: int = 0
+        self.last_bonus: int = 0
+        for member in self.members:
+            self.wins += standings.through_week(member.id, 'wins')
+            self.losses += standings.through_week(member.id, 'losses')
+            self.bonus += standings.through_week(member.id, 'bonus')
+            self.last_wins += standings.for_week(member.id, 'wins', active_week)
+            self.last_losses += standings.for_week(member.id, 'losses', active_week)
+            self.last_bonus += standings.for_week(member.id, 'bonus', active_week)
+
+    @property
+    def total_points(self) -> int:
+        return self.wins + self.bonus
+
+    @property
+    def winning_pct(self) -> float:
+        """ Returns the winning percentage"""
+        wins_and_losses = float(self.wins + self.losses)
+        if wins_and_losses:
+            return self.wins / wins_and_losses
+
+        return 0
+
+
+class TGFPModel:
+    """
+    Base class for the TGFP model classes.
+
+    Remembers the original value of each public attribute assigned since the object was
+    loaded or last saved, so ``save()`` only ``$set`` s the fields that actually changed and
+    skips the round trip when nothing did.  List and dict fields are compared against a
+    shallow copy taken when the object was loaded / saved, so ``clan.member_ids.append()``
+    is noticed too, changes nested deeper need :meth:`mark_dirty`.
+    """
+    __slots__ = ('_changed_from', '_tgfp', '_id')
+    # public fields stored in the document, set by every model class
+    _FIELDS: tuple = ()
+    # the collection the model is stored in, and the fields TGFP's lookup indexes key on
+    _COLLECTION: str = ''
+    _KEY_FIELDS: tuple = ()
+    _changed_from: Dict[str, object]
+    _tgfp: TGFP
+
+    def __setattr__(self, name, value):
+        if not name.startswith('_') and name not in self._changed_from:
+            self._changed_from[name] = getattr(self, name, _UNSET)
+        super().__setattr__(name, value)
+
+    def _mongo_value(self, name: str):
+        value = getattr(self, name)
+        if isinstance(value, TGFPPickDetail):
+            return value.mongo_data()
+        return value
+
+    def mongo_data(self):
+        filtered_dict = {}
+        for key in self._FIELDS:
+            if hasattr(self, key):
+                filtered_dict.update({key: self._mongo_value(key)})
+
+        return filtered_dict
+
+    def changed_data(self) -> dict:
+        """ Returns the public fields whose value differs from the loaded / saved one """
+        return {
+            name: self._mongo_value(name)
+            for name, original in self._changed_from.items()
+            if hasattr(self, name) and getattr(self, name) != original
+        }
+
+    def _upsert_data(self, *key_fields: str) -> dict:
+        """
+        The fields a save upserting on ``key_fields`` sets: the changed ones, or all of them
+        once a key field changed, since the upsert then inserts a document under the new key
+        """
+        changed = self.changed_data()
+        if changed.keys() & set(key_fields):
+            return self.mongo_data()
+        return changed
+
+    def mark_dirty(self, *fields: str):
+        """ Flags ``fields`` as changed, for changes nested inside list / dict values """
+        for field in fields:
+            self._changed_from[field] = _UNSET
+
+    def mark_clean(self):
+        """ Treats the current state as the one stored in the database """
+        self._changed_from.clear()
+        self._track_in_place(self._FIELDS)
+
+    def _track_in_place(self, fields: Iterable[str]):
+        """ Keeps a shallow copy of the list / dict ``fields``, to notice changes in place """
+        for field in fields:
+            value = getattr(self, field, None)
+            if isinstance(value, (list, dict)):
+                self._changed_from[field] = copy.copy(value)
+
+    @classmethod
+    def _loaded(cls, tgfp: TGFP, document: dict) -> TGFPModel:
+        """
+        A model for ``document`` as read from the database, so with nothing to save.  The
+        constructors leave every field changed: a model built from a caller's data (even
+        with an ``_id``) is written whole by its first ``save()``.
+        """
+        model = cls(tgfp=tgfp, data=document)
+        model.mark_clean()
+        return model
+
+    @classmethod
+    def _streamed(cls, tgfp: TGFP, document: dict) -> TGFPModel:
+        """
+        A model for a document streamed by ``iter_picks`` / ``iter_games``, built without
+        the constructor so none of its ids are interned.  Fields missing from ``document``
+        (read with a projection) are left unset.
+        """
+        # pylint: disable=protected-access,attribute-defined-outside-init
+        model = cls.__new__(cls)
+        model._changed_from = {}
+        model._tgfp = tgfp
+        model._id = document.get('_id')
+        for field in cls._FIELDS:
+            if field in document:
+                setattr(model, field, document[field])
+        model.mark_clean()
+        return model
+
+    def _write_args(self) -> tuple:
+        """
+        ``_save_args`` stamping ``updated_at`` with the server's clock when the write is
+        applied, see ``TGFPCacheWatcher``
+        """
+        # pylint: disable=no-member
+        collection, query, update, upsert = self._save_args()
+        update['$currentDate'] = {'updated_at': True}
+        return collection, query, update, upsert
+
+    def refresh(self, fresh: TGFPModel):
+        """
+        Copies the stored fields of ``fresh``, a newer read of the same document, into this
+        object so the references callers hold see the change.  Fields changed locally and
+        not saved yet keep their local value.
+        """
+        unsaved = set(self.changed_data())
+        for field in self._FIELDS:
+            if field not in unsaved and hasattr(fresh, field):
+                setattr(self, field, getattr(fresh, field))
+        for field in set(self._changed_from) - unsaved:
+            del self._changed_from[field]
+        self._track_in_place(set(self._FIELDS) - unsaved)
+
+    def _saved(self, inserted: bool):
+        """ Called once the model is written and has its ``_id``, ``inserted`` if it created it """
+
+    def save(self):
+        self._tgfp.save_model(self)
+
+    async def asave(self):
+        """ Awaitable ``save()``, for models that belong to an ``AsyncTGFP`` """
+        await self._tgfp.asave_model(self)
+
+
+class TGFPPickDetail(MutableSequence):
+    """
+    Compact storage for a pick's ``pick_detail``: parallel lists of game ids and winner ids
+    instead of one dict per game.  Reads hand back ``{'game_id': ..., 'winner_id': ...}``
+    dicts, so change an entry by assigning it (``detail[i] = {...}``) rather than editing
+    the returned dict.  In place changes flag the owning pick's ``pick_detail`` as dirty.
+    """
+    __slots__ = ('_owner', 'game_ids', 'winner_ids')
+
+    def __init__(self, entries: Iterable[dict] = (), owner: Optional[TGFPModel] = None):
+        self._owner: Optional[TGFPModel] = owner
+        self.game_ids: List[ObjectId] = []
+        self.winner_ids: List[ObjectId] = []
+        for entry in entries:
+            self.game_ids.append(self._intern(entry['game_id']))
+            self.winner_ids.append(self._intern(entry['winner_id']))
+
+    def _intern(self, object_id):
+        # pylint: disable=protected-access
+        if self._owner is None or not isinstance(object_id, ObjectId):
+            return object_id
+        return self._owner._tgfp.intern_id(object_id)
+
+    def _changed(self):
+        if self._owner is not None:
+            self._owner.mark_dirty('pick_detail')
+
+    def __len__(self):
+        return len(self.game_ids)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [
+                {'game_id': game_id, 'winner_id': winner_id}
+                for game_id, winner_id in zip(self.game_ids[index], self.winner_ids[index])
+            ]
+        return {'game_id': self.game_ids[index], 'winner_id': self.winner_ids[index]}
+
+    def __setitem__(self, index, entry):
+        if isinstance(index, slice):
+            entries = list(entry)
+            self.game_ids[index] = [self._intern(item['game_id']) for item in entries]
+            self.winner_ids[index] = [self._intern(item['winner_id']) for item in entries]
+        else:
+            self.game_ids[index] = self._intern(entry['game_id'])
+            self.winner_ids[index] = self._intern(entry['winner_id'])
+        self._changed()
+
+    def __delitem__(self, index):
+        del self.game_ids[index]
+        del self.winner_ids[index]
+        self._changed()
+
+    def insert(self, index, value):
+        self.game_ids.insert(index, self._intern(value['game_id']))
+        self.winner_ids.insert(index, self._intern(value['winner_id']))
+        self._changed()
+
+    def __eq__(self, other):
+        if isinstance(other, TGFPPickDetail):
+            return self.game_ids == other.game_ids and self.winner_ids == other.winner_ids
+        if isinstance(other, list):
+            return self.mongo_data() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(self.mongo_data())
+
+    def winner_for_game_id(self, game_id) -> Optional[ObjectId]:
+        """ Returns the picked winner of ``game_id`` or None if the game isn't in the detail """
+        try:
+            return self.winner_ids[self.game_ids.index(game_id)]
+        except ValueError:
+            return None
+
+    def mongo_data(self) -> List[dict]:
+        """ Returns the detail the way it is stored in the picks collection """
+        return self[:]
+
+
+class TGFPTeam(TGFPModel):
     # pylint: disable=too-many-instance-attributes
     """
     TGFP Class for a 'team'
     """
+    _FIELDS = (
+        'short_name', 'city', 'long_name', 'wins', 'losses', 'ties', 'tgfp_nfl_team_id',
+        'logo_url', 'full_name', 'discord_emoji'
+    )
+    _COLLECTION = 'teams'
+    _KEY_FIELDS = ('tgfp_nfl_team_id',)
+    __slots__ = _FIELDS
 
     def __init__(self, tgfp, data):
+        self._changed_from = {}
         self._tgfp = tgfp
         self._id = data['_id']
         self.short_name = data['short_name']
@@ -354,21 +2093,8 @@ class TGFPTeam:
         self.full_name = self.city + ' ' + self.long_name
         self.discord_emoji = data['discord_emoji']
 
-    def mongo_data(self):
-        filtered_dict = {}
-        for key, value in self.__dict__.items():
-            if not key.startswith('_'):
-                filtered_dict.update({key: value})
-
-        return filtered_dict
-
-    def save(self):
-        self._tgfp.mongodb.teams.update_one(
-            {
-                "_id": self._id
-            },
-            {"$set": self.mongo_data()}
-        )
+    def _save_args(self) -> tuple:
+        return 'teams', {"_id": self._id}, {"$set": self.changed_data()}, False
 
     @property
     def id(self):
@@ -376,13 +2102,17 @@ class TGFPTeam:
         return self._id
 
 
-class TGFPPlayer:
+class TGFPPlayer(TGFPModel):
     # pylint: disable=too-many-instance-attributes
     """ Class for a player """
+    _FIELDS = ('last_name', 'first_name', 'nick_name', 'email', 'active', 'discord_id')
+    _COLLECTION = 'players'
+    _KEY_FIELDS = ('email', 'discord_id')
+    __slots__ = ('_pick_history',) + _FIELDS
 
     def __init__(self, tgfp, data):
+        self._changed_from = {}
         self._tgfp = tgfp
-        self._picks: Optional[List[TGFPPick]] = None
         self._pick_history: Optional[List[TGFPPick]] = None
         self._id = data['_id']
         self.last_name = data['last_name']
@@ -397,60 +2127,37 @@ class TGFPPlayer:
         # pylint: disable=invalid-name
         return self._id
 
-    # noinspection DuplicatedCode
     def wins(self, week_through=None, week_no=None):
         """return the number of wins optionally for a single week, or through week_no"""
         assert week_no is None or week_through is None
-        if not self._picks:
-            self.load_picks()
-        local_wins = 0
-        for pick in self._picks:
-            if week_no is None and week_through is None:
-                local_wins += pick.wins
-            elif week_through and pick.week_no <= week_through:
-                local_wins += pick.wins
-            elif week_no and pick.week_no == week_no:
-                local_wins += pick.wins
-        return local_wins
-
+        if week_no is not None:
+            return self._tgfp.standings().for_week(self._id, 'wins', week_no)
+        return self._tgfp.standings().through_week(self._id, 'wins', week_through)
 
     def win_csv(self):
+        standings: TGFPStandings = self._tgfp.standings()
         week_range = range(1, self._tgfp.current_week())
         win_csv = f"{self.nick_name}"
         for week_no in week_range:
-            points = self.wins(week_through=week_no) + self.bonus(week_through=week_no)
-            win_csv += f",{points}"
+            win_csv += f",{standings.through_week(self._id, 'points', week_no)}"
         return win_csv
 
     def losses(self, week_no=None):
-        if not self._picks:
-            self.load_picks()
-        losses = 0
-        for pick in self._picks:
-            if not week_no or pick.week_no == week_no:
-                losses += pick.losses
-        return losses
-
-    # noinspection DuplicatedCode
+        if week_no:
+            return self._tgfp.standings().for_week(self._id, 'losses', week_no)
+        return self._tgfp.standings().through_week(self._id, 'losses')
+
     def bonus(self, week_through=None, week_no=None):
         assert week_no is None or week_through is None
-        if not self._picks:
-            self.load_picks()
-        bonus = 0
-        for pick in self._picks:
-            if week_no is None and week_through is None:
-                bonus += pick.bonus
-            elif week_through and pick.week_no <= week_through:
-                bonus += pick.bonus
-            elif week_no and pick.week_no == week_no:
-                bonus += pick.bonus
-        return bonus
+        if week_no is not None:
+            return self._tgfp.standings().for_week(self._id, 'bonus', week_no)
+        return self._tgfp.standings().through_week(self._id, 'bonus', week_through)
 
     def last_bonus(self):
         return self.bonus(week_no=self._tgfp.current_active_week())
 
     def total_points(self):
-        return self.wins() + self.bonus()
+        return self._tgfp.standings().through_week(self._id, 'points')
 
     def last_wins(self):
         return self.wins(week_no=self._tgfp.current_active_week())
@@ -459,18 +2166,12 @@ class TGFPPlayer:
         return self.losses(week_no=self._tgfp.current_active_week())
 
     def load_picks(self):
-        self._picks = self._tgfp.find_picks(player_id=self._id)
+        """ Loads the season's standings, which the win / loss / bonus methods read """
+        self._tgfp.standings()
 
     def pick_history(self) -> List[TGFPPick]:
         if not self._pick_history:
-            self._pick_history = []
-            for season in self._tgfp.seasons:
-                self._pick_history.extend(
-                    self._tgfp.find_picks(
-                        season=season,
-                        player_id=self._id
-                    )
-                )
+            self._pick_history = self._tgfp.pick_history(self._id)
         return self._pick_history
 
 
@@ -491,43 +2192,38 @@ class TGFPPlayer:
 
         return None
 
-    def mongo_data(self):
-        filtered_dict = {}
-        for key, value in self.__dict__.items():
-            if not key.startswith('_'):
-                filtered_dict.update({key: value})
-
-        return filtered_dict
-
-    def save(self):
-        self._tgfp.mongodb.players.update_one(
-            {
-                "_id": self._id
-            },
-            {"$set": self.mongo_data()},
-            upsert=True
-        )
+    def _save_args(self) -> tuple:
+        return 'players', {"_id": self._id}, {"$set": self.changed_data()}, True
 
 
-class TGFPGame:
+class TGFPGame(TGFPModel):
     # pylint: disable=too-many-instance-attributes
     """ Game class for the TGFP """
+    _FIELDS = GAME_FIELDS
+    _COLLECTION = 'games'
+    _KEY_FIELDS = ('tgfp_nfl_game_id', 'week_no', 'season')
+    __slots__ = ('_saved_state',) + _FIELDS
 
     def __init__(self, tgfp, data=None):
+        self._changed_from = {}
         self._tgfp = tgfp
         self._id = None
+        # (status, home score, road score) as last read from / written to the db, a status
+        # change invalidates the current week and a change of a final result rescores picks
+        self._saved_state: Optional[tuple] = None
 
         if data:
             if '_id' in data:
-                self._id = data['_id']
+                self._id = tgfp.intern_id(data['_id'])
             # below are mandatory fields in the DB
-            self.favorite_team_id = data['favorite_team_id']
+            self.favorite_team_id = tgfp.intern_id(data['favorite_team_id'])
             # Status: STATUS_IN_PROGRESS, STATUS_FINAL, STATUS_SCHEDULED
             self.game_status = data['game_status']
-            self.home_team_id = data['home_team_id']
+            self.home_team_id = tgfp.intern_id(data['home_team_id'])
             self.home_team_score = data['home_team_score']
-            self.road_team_id = data['road_team_id']
+            self.road_team_id = tgfp.intern_id(data['road_team_id'])
             self.road_team_score = data['road_team_score']
+            self._saved_state = self._state()
             self.spread = data['spread']
             self.start_time = data['start_time']
             self.week_no = data['week_no']
@@ -536,14 +2232,6 @@ class TGFPGame:
             if 'extra_info' in data:
                 self.extra_info = data['extra_info']
 
-    def mongo_data(self):
-        filtered_dict = {}
-        for key, value in self.__dict__.items():
-            if not key.startswith('_'):
-                filtered_dict.update({key: value})
-
-        return filtered_dict
-
     @property
     def is_pregame(self):
         return self.game_status == 'STATUS_SCHEDULED'
@@ -552,22 +2240,39 @@ class TGFPGame:
     def is_final(self):
         return self.game_status == 'STATUS_FINAL'
 
-    def save(self):
-        result = self._tgfp.mongodb.games.update_one(
-            {
-                "tgfp_nfl_game_id": self.tgfp_nfl_game_id
-            },
-            {"$set": self.mongo_data()},
-            upsert=True
+    def _save_args(self) -> tuple:
+        return (
+            'games',
+            {"tgfp_nfl_game_id": self.tgfp_nfl_game_id},
+            {"$set": self._upsert_data('tgfp_nfl_game_id')},
+            True
         )
-        if result.upserted_id:
-            self._id = result.upserted_id
-        else:
-            found_games = self._tgfp.find_games(tgfp_nfl_game_id=self.tgfp_nfl_game_id)
-            found_game: TGFPGame
-            found_game = found_games[0]
-            self._id = found_game.id
-        assert self._id is not None
+
+    def _saved(self, inserted: bool):
+        state = self._state()
+        saved_state = self._saved_state or (None, None, None)
+        self._saved_state = state
+        if inserted or self.game_status != saved_state[0]:
+            self._tgfp.invalidate_current_week()
+        if inserted:
+            self._tgfp.invalidate_seasons()
+        if state != saved_state and 'STATUS_FINAL' in (self.game_status, saved_state[0]):
+            self._tgfp.rescore_game(self)
+
+    def _state(self) -> tuple:
+        return self.game_status, self.home_team_score, self.road_team_score
+
+    def refresh(self, fresh: TGFPModel):
+        super().refresh(fresh)
+        self._saved_state = self._state()
+
+    @classmethod
+    def _streamed(cls, tgfp: TGFP, document: dict) -> TGFPModel:
+        game = super()._streamed(tgfp, document)
+        game._saved_state = tuple(
+            document.get(field) for field in ('game_status', 'home_team_score', 'road_team_score')
+        )
+        return game
 
     @property
     def id(self):
@@ -659,14 +2364,27 @@ class TGFPGame:
 
     @property
     def pacific_start_time(self):
+        # pylint: disable=import-outside-toplevel
+        import pytz
+
         utc_dt = self.start_time.replace(tzinfo=pytz.utc)
         pac_dt = pytz.timezone('US/Pacific')
         return pac_dt.normalize(utc_dt.astimezone(pac_dt))
 
 
 # pylint: disable=too-many-instance-attributes
-class TGFPPick:
+class TGFPPick(TGFPModel):
     """ Class for the player's picks """
+    _FIELDS = PICK_FIELDS
+    _COLLECTION = 'picks'
+    _KEY_FIELDS = (
+        'player_id', 'week_no', 'season', 'lock_team_id', 'upset_team_id', 'pick_detail'
+    )
+    # pick_detail is a property over the compact _pick_detail
+    __slots__ = ('_pick_detail',) + tuple(
+        field for field in _FIELDS if field != 'pick_detail'
+    )
+
     class PickDetail:
         """ Detailed pick information"""
         def __init__(self, tgfp, data):
@@ -675,14 +2393,15 @@ class TGFPPick:
             self.winner_id = data['winner_id']
 
     def __init__(self, tgfp, data):
+        self._changed_from = {}
         self._tgfp = tgfp
         self._id = None
         if data:
             if '_id' in data:
                 self._id = data['_id']
-            self.lock_team_id = data['lock_team_id']
-            self.player_id = data['player_id']
-            self.upset_team_id = data['upset_team_id']
+            self.lock_team_id = tgfp.intern_id(data['lock_team_id'])
+            self.player_id = tgfp.intern_id(data['player_id'])
+            self.upset_team_id = tgfp.intern_id(data['upset_team_id'])
             self.week_no = data['week_no']
             self.season = data['season']
             self.wins = data['wins']
@@ -696,20 +2415,36 @@ class TGFPPick:
             self.upset_team_id = None
             self.season = tgfp.current_season()
 
+    @classmethod
+    def _streamed(cls, tgfp: TGFP, document: dict) -> TGFPModel:
+        # pylint: disable=protected-access
+        pick = super()._streamed(
+            tgfp, {field: value for field, value in document.items() if field != 'pick_detail'}
+        )
+        if 'pick_detail' in document:
+            # built owner-less, so its ids aren't interned, edits still flag the pick dirty
+            detail = TGFPPickDetail(document['pick_detail'])
+            detail._owner = pick
+            pick._pick_detail = detail
+        return pick
+
+    @property
+    def pick_detail(self) -> TGFPPickDetail:
+        return self._pick_detail
+
+    @pick_detail.setter
+    def pick_detail(self, pick_detail: Iterable[dict]):
+        self._pick_detail = TGFPPickDetail(pick_detail, owner=self)
+
     def winner_for_game_id(self, game_id) -> Optional[ObjectId]:
-        winner_id = None
-        for pick in self.pick_detail:
-            if pick['game_id'] == game_id:
-                winner_id = pick['winner_id']
-                break
-        return winner_id
+        return self.pick_detail.winner_for_game_id(game_id)
 
     @property
     def games(self) -> List[TGFPGame]:
         return_games: List[TGFPGame] = []
-        for game in self.pick_detail:
+        for game_id in self.pick_detail.game_ids:
             return_games.append(
-                self._tgfp.find_games(game_id=game['game_id'])[0]
+                self._tgfp.find_games(game_id=game_id)[0]
             )
         return return_games
 
@@ -721,20 +2456,25 @@ class TGFPPick:
         return return_games
 
     def load_record(self, games=None):
+        """
+        Recomputes wins / losses / bonus from the games in ``pick_detail``
+        Args:
+            games: the week's games, either a list or a dict keyed by game id
+              (default: the games of this pick's week)
+        """
         # go through each game in pick_detail
+        self._tgfp.invalidate_standings(self.season)
         self.wins = 0
         self.losses = 0
         self.bonus = 0
 
-        games_array = self._tgfp.find_games(
-            week_no=self.week_no,
-            season=self.season) if games is None else games
+        if games is None:
+            games = self._tgfp.find_games(week_no=self.week_no, season=self.season)
+        games_by_id: Dict[ObjectId, TGFPGame] = \
+            games if isinstance(games, dict) else {game.id: game for game in games}
 
         for pick in self.pick_detail:
-            game: Optional[TGFPGame] = None
-            for game in games_array:
-                if game.id == pick['game_id']:
-                    break
+            game: Optional[TGFPGame] = games_by_id.get(pick['game_id'])
             if game is None:
                 raise GameNotFoundException
             if not game.is_final:
@@ -766,19 +2506,16 @@ class TGFPPick:
         if winning_team_id == self.upset_team_id:
             self.bonus += 1
 
-    def save(self):
-        result = self._tgfp.mongodb.picks.update_one(
-            {
-                "player_id": self.player_id,
-                "week_no": self.week_no,
-                "season": self.season
-            },
-            {"$set": self.mongo_data()},
-            upsert=True
+    def _save_args(self) -> tuple:
+        return (
+            'picks',
+            {"player_id": self.player_id, "week_no": self.week_no, "season": self.season},
+            {"$set": self._upsert_data('player_id', 'week_no', 'season')},
+            True
         )
-        if result.upserted_id:
-            self._id = result.upserted_id
-        assert self._id is not None
+
+    def _saved(self, inserted: bool):
+        self._tgfp.invalidate_standings(self.season)
 
     # pylint: disable=invalid-name
     @property
@@ -787,19 +2524,18 @@ class TGFPPick:
 
     # pylint: enable=invalid-name
 
-    def mongo_data(self):
-        filtered_dict = {}
-        for key, value in self.__dict__.items():
-            if not key.startswith('_'):
-                filtered_dict.update({key: value})
-
-        return filtered_dict
 
-
-class TGFPClan:
+class TGFPClan(TGFPModel):
     """ Class for the 'clans' of the great football pool """
+    _FIELDS = ('clan_name', 'member_ids', 'captain_id', 'discord_role_id')
+    _COLLECTION = 'clans'
+    __slots__ = ('_members',) + _FIELDS
+
     def __init__(self, tgfp, data=None):
+        self._changed_from = {}
         self._tgfp: TGFP = tgfp
+        self._members: Optional[tuple] = None
+        self._id = None
         if data:
             if '_id' in data:
                 self._id = data['_id']
@@ -813,30 +2549,24 @@ class TGFPClan:
     def id(self):
         return self._id
 
-    def mongo_data(self):
-        filtered_dict = {}
-        for key, value in self.__dict__.items():
-            if not key.startswith('_'):
-                filtered_dict.update({key: value})
-
-        return filtered_dict
+    def _save_args(self) -> tuple:
+        # a new clan gets its id here, upserting on a null _id would store it as null
+        return 'clans', {"_id": self._id or ObjectId()}, {"$set": self.changed_data()}, True
 
-    def save(self):
-        self._tgfp.mongodb.clans.update_one(
-            {
-                "_id": self._id
-            },
-            {"$set": self.mongo_data()},
-            upsert=True
-        )
+    def _saved(self, inserted: bool):
+        self._tgfp.invalidate_clan_standings()
 
     @property
     def members(self) -> List[TGFPPlayer]:
-        """ Return a list of players based on the member list """
-        members: List[TGFPPlayer] = []
-        for member_data in self.member_ids:
-            members.append(self._tgfp.find_players(player_id=member_data['member_id'])[0])
-        return members
+        """ Return a list of players based on the member list, resolved once per member list """
+        cached = self._members
+        if cached is None or cached[0] is not self.member_ids or cached[1] != len(self.member_ids):
+            members: List[TGFPPlayer] = []
+            for member_data in self.member_ids:
+                members.append(self._tgfp.find_players(player_id=member_data['member_id'])[0])
+            cached = (self.member_ids, len(self.member_ids), members)
+            self._members = cached
+        return cached[2]
 
     def add_member(self, discord_id: int) -> Optional[TGFPPlayer]:
         """
@@ -866,66 +2596,38 @@ class TGFPClan:
     @property
     def wins(self):
         """ Adds up player wins and returns the result """
-        wins: int = 0
-        for member in self.members:
-            wins += member.wins()
-
-        return wins
+        return self._tgfp.clan_standing(self).wins
 
     @property
     def losses(self):
         """ Adds up player losses and returns the result """
-        losses: int = 0
-        for member in self.members:
-            losses += member.losses()
-
-        return losses
+        return self._tgfp.clan_standing(self).losses
 
     @property
     def bonus(self):
         """ Adds up player bonus and returns the result """
-        bonus: int = 0
-        for member in self.members:
-            bonus += member.bonus()
-
-        return bonus
+        return self._tgfp.clan_standing(self).bonus
 
     @property
     def last_wins(self):
         """ Adds up player last_wins and returns the result """
-        last_wins: int = 0
-        for member in self.members:
-            last_wins += member.last_wins()
-
-        return last_wins
+        return self._tgfp.clan_standing(self).last_wins
 
     @property
     def last_losses(self):
         """ Adds up player last_losses and returns the result """
-        last_losses: int = 0
-        for member in self.members:
-            last_losses += member.last_losses()
-
-        return last_losses
+        return self._tgfp.clan_standing(self).last_losses
 
     @property
     def last_bonus(self):
         """ Adds up player last_bonus and returns the result """
-        last_bonus: int = 0
-        for member in self.members:
-            last_bonus += member.last_bonus()
-
-        return last_bonus
+        return self._tgfp.clan_standing(self).last_bonus
 
     @property
     def winning_pct(self):
         """ Returns the winning percentage"""
-        wins_and_losses = float(self.wins + self.losses)
-        if wins_and_losses:
-            return self.wins / wins_and_losses
-
-        return 0
+        return self._tgfp.clan_standing(self).winning_pct
 
     @property
     def total_points(self):
-        return self.wins + self.bonus
+        return self._tgfp.clan_standing(self).total_points
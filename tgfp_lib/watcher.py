@@ -0,0 +1,222 @@
+"""
+  Opt-in watcher keeping a long lived TGFP's caches current with the writes other processes
+  make, from a mongo change stream or, where change streams aren't available (a standalone
+  server), by polling the ``updated_at`` stamp every save sets
+"""
+import logging
+import queue
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+from pymongo.errors import ConfigurationError, OperationFailure, PyMongoError
+
+from .tgfp import TGFP
+
+logger = logging.getLogger(__name__)
+
+COLLECTIONS = ('teams', 'players', 'clans', 'games', 'picks')
+
+
+class TGFPCacheWatcher:
+    # pylint: disable=too-many-instance-attributes
+    """
+    Collects the changes made to the tgfp collections on a background thread and applies
+    them to the TGFP's cached objects with :meth:`TGFP.apply_change`.
+
+    The background thread only queues the changes, they are applied by
+    :meth:`apply_pending` in the thread using the TGFP (a web app calls it at the start of
+    each request), so the cached objects are never changed under a running lookup.
+
+    Polling finds inserts and updates written through TGFP (which stamps ``updated_at``
+    with the server's clock as the write is applied), it can't see deletes or writes made
+    around TGFP.  Each poll reads back ``overlap`` seconds before the newest stamp it saw,
+    so a write stamped a little earlier but committed after it is still found, and skips
+    the documents it already queued.  Change streams need a replica set, a
+    single node one is enough (see ``tgfp-mongodb-rs`` in dev-docker-compose.yaml).
+
+    Example::
+
+        watcher = TGFPCacheWatcher(tgfp)
+        watcher.start()
+        ...
+        watcher.apply_pending()
+    """
+
+    def __init__(
+            self,
+            tgfp: TGFP,
+            collections: Iterable[str] = COLLECTIONS,
+            poll_interval: float = 5.0,
+            use_change_stream: bool = True,
+            overlap: float = 2.0):
+        """
+        Args:
+            tgfp: the TGFP whose caches are kept current
+            collections: the collections to follow
+            poll_interval: seconds between two polls when polling
+            use_change_stream: False to poll even when change streams are available
+            overlap: seconds each poll reads back before the newest ``updated_at`` seen
+        """
+        self.tgfp: TGFP = tgfp
+        self.collections = tuple(collections)
+        self.poll_interval: float = poll_interval
+        self.use_change_stream: bool = use_change_stream
+        # 'change_stream' or 'polling' once started
+        self.mode: Optional[str] = None
+        self._changes: queue.Queue = queue.Queue()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._resume_token = None
+        self.overlap: timedelta = timedelta(seconds=overlap)
+        # collection -> newest updated_at seen, None while nothing is stamped
+        self._last_seen: Dict[str, Optional[datetime]] = {}
+        # collection -> {_id: updated_at} of the documents queued inside the overlap
+        self._seen: Dict[str, dict] = {}
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def start(self):
+        """ Starts following the collections on a daemon thread """
+        if self._thread is not None:
+            return
+        if not self._last_seen:
+            self._mark_polled()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='tgfp-cache-watcher', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """ Stops the background thread, changes already queued can still be applied """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def pending(self) -> int:
+        """ Number of changes queued and not applied yet """
+        return self._changes.qsize()
+
+    def apply_pending(self) -> int:
+        """
+        Applies the queued changes to the TGFP's cached objects
+        Return:
+            int: the number of cached objects added, changed or removed
+        """
+        applied = 0
+        while True:
+            try:
+                change = self._changes.get_nowait()
+            except queue.Empty:
+                return applied
+            if self.tgfp.apply_change(*change):
+                applied += 1
+
+    def poll(self) -> int:
+        """
+        Queues the documents saved since the last poll (the first one only marks where
+        to start), this is what the background thread runs in polling mode
+        Return:
+            int: the number of changes queued
+        """
+        if not self._last_seen:
+            self._mark_polled()
+            return 0
+        queued = 0
+        for collection in self.collections:
+            for document in self._saved_since(collection):
+                self._changes.put((collection, 'update', document['_id'], document))
+                queued += 1
+        return queued
+
+    def _saved_since(self, collection: str) -> List[dict]:
+        """ The documents of ``collection`` saved since its last poll and not queued yet """
+        last_seen = self._last_seen[collection]
+        stamped = {'$exists': True} if last_seen is None else {'$gte': last_seen - self.overlap}
+        cursor = self.tgfp.mongodb[collection].find({'updated_at': stamped}).sort('updated_at', 1)
+        seen = self._seen.setdefault(collection, {})
+        saved = []
+        for document in cursor:
+            if seen.get(document['_id']) != document['updated_at']:
+                seen[document['_id']] = document['updated_at']
+                saved.append(document)
+            last_seen = document['updated_at']
+        self._last_seen[collection] = last_seen
+        if last_seen is not None:
+            # stamps older than the overlap aren't read again
+            horizon = last_seen - self.overlap
+            for document_id in [key for key, stamp in seen.items() if stamp < horizon]:
+                del seen[document_id]
+        return saved
+
+    def _mark_polled(self):
+        """
+        Starts polling from the newest ``updated_at`` of each collection, the documents
+        already saved count as seen
+        """
+        for collection in self.collections:
+            newest = self.tgfp.mongodb[collection].find_one(
+                {'updated_at': {'$exists': True}}, {'updated_at': 1}, sort=[('updated_at', -1)]
+            )
+            self._last_seen[collection] = newest['updated_at'] if newest else None
+            self._saved_since(collection)
+
+    def _run(self):
+        if self.use_change_stream and self._follow_change_stream():
+            return
+        self.mode = 'polling'
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.poll()
+            except Exception:  # pylint: disable=broad-exception-caught
+                logger.exception("polling for tgfp changes failed")
+
+    def _follow_change_stream(self) -> bool:
+        """
+        Follows the change stream until :meth:`stop`, reopening it from the last resume token
+        after a connection error (a failover, the server out of reach for a while)
+        Return:
+            bool: False when the change stream can't be used, the caller polls instead.  The
+            polls read everything saved since :meth:`start` marked the collections, so the
+            changes the stream missed are still queued.
+        """
+        while not self._stop.is_set():
+            try:
+                self._watch()
+            except (ConfigurationError, OperationFailure) as error:
+                logger.info("change streams not available (%s), polling instead", error)
+                return False
+            except PyMongoError as error:
+                logger.warning("tgfp change stream failed (%s), reopening it", error)
+                self._stop.wait(self.poll_interval)
+        return True
+
+    def _watch(self):
+        pipeline = [{'$match': {
+            'ns.coll': {'$in': list(self.collections)},
+            'operationType': {'$in': ['insert', 'update', 'replace', 'delete']}
+        }}]
+        with self.tgfp.mongodb.watch(
+                pipeline,
+                full_document='updateLookup',
+                resume_after=self._resume_token,
+                max_await_time_ms=500) as stream:
+            self.mode = 'change_stream'
+            while not self._stop.is_set():
+                change = stream.try_next()
+                if change is None:
+                    continue
+                self._resume_token = stream.resume_token
+                operation = change['operationType']
+                document = change.get('fullDocument')
+                if operation != 'delete' and document is None:
+                    # deleted before the lookup, its delete event follows
+                    continue
+                self._changes.put(
+                    (change['ns']['coll'], operation, change['documentKey']['_id'], document)
+                )